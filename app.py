@@ -1,16 +1,60 @@
-from flask import Flask, render_template_string, request, jsonify, session, redirect, url_for
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, abort, g, render_template, request, jsonify, session, redirect, url_for
+from flask_socketio import SocketIO, emit, join_room, leave_room
+from markupsafe import Markup
+from werkzeug.routing import BaseConverter
 from functools import wraps
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from eventlet.event import Event
+from eventlet.queue import LightQueue
+from eventlet.semaphore import Semaphore
+from eventlet import tpool
+from greenlet import getcurrent
+import eventlet
+import base64
+import gzip
 import json
 import os
 import sqlite3
+import re
+import time
 import uuid
+import zlib
 import hashlib
+import mimetypes
+import fcntl
+from metrics import Registry, DB_BUCKETS, COUNT_BUCKETS, CONTENT_TYPE as METRICS_CONTENT_TYPE
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'garion-kanban-secret-2026')
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
+
+# Boards: every task belongs to one board and sockets only receive events for
+# the board they joined. /api/tasks is the default board.
+DEFAULT_BOARD = 'default'
+BOARD_ID_PATTERN = r'[A-Za-z0-9_-]{1,64}'
+
+class BoardConverter(BaseConverter):
+    regex = BOARD_ID_PATTERN
+
+app.url_map.converters['board'] = BoardConverter
+
+# Multi-worker mode: workers share broadcasts through a message queue
+# (redis://, kafka://, amqp:// or the bundled unix:// broker) and clients
+# use websocket only, so no sticky sessions are needed.
+SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+SOCKETIO_TRANSPORTS = ['websocket'] if SOCKETIO_MESSAGE_QUEUE else ['polling', 'websocket']
+SHARED_BOARD = bool(SOCKETIO_MESSAGE_QUEUE)
+if SOCKETIO_MESSAGE_QUEUE and SOCKETIO_MESSAGE_QUEUE.startswith('unix://'):
+    from local_mq import UnixSocketManager
+    socketio_queue = {'client_manager': UnixSocketManager(SOCKETIO_MESSAGE_QUEUE, channel='flask-socketio')}
+else:
+    socketio_queue = {'message_queue': SOCKETIO_MESSAGE_QUEUE}
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet', transports=SOCKETIO_TRANSPORTS, **socketio_queue)
 
 DB_PATH = os.environ.get('DB_PATH', '/tmp/kanban.db')
 
@@ -19,15 +63,277 @@ AUTH_USER = os.environ.get('KANBAN_USER', 'melgar')
 AUTH_PASS = os.environ.get('KANBAN_PASS', 'swap2026')
 API_KEY = os.environ.get('KANBAN_API_KEY', 'garion-api-key-2026')
 
+# Database config
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+DB_STATEMENT_CACHE = int(os.environ.get('DB_STATEMENT_CACHE', 256))
+WRITE_BATCH_SIZE = int(os.environ.get('WRITE_BATCH_SIZE', 128))
+API_PAGE_MAX = int(os.environ.get('API_PAGE_MAX', 500))
+STREAM_CHUNK = int(os.environ.get('STREAM_CHUNK', 200))
+BATCH_MAX_OPS = int(os.environ.get('BATCH_MAX_OPS', 500))
+CHANGELOG_RETENTION = int(os.environ.get('CHANGELOG_RETENTION', 10000))
+CHANGELOG_COMPACT_EVERY = 1000
+BROADCAST_WINDOW_MS = int(os.environ.get('BROADCAST_WINDOW_MS', 30))
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', 50))
+STATS_DAYS = int(os.environ.get('STATS_DAYS', 30))
+STATS_SAMPLE = int(os.environ.get('STATS_SAMPLE', 1000))
+STATS_DIMENSIONS = ('status', 'priority', 'source')
+ARCHIVE_AFTER_DAYS = float(os.environ.get('ARCHIVE_AFTER_DAYS', 14))
+ARCHIVE_INTERVAL_SECONDS = int(os.environ.get('ARCHIVE_INTERVAL_SECONDS', 3600))
+ARCHIVE_CHUNK = int(os.environ.get('ARCHIVE_CHUNK', 200))
+IMPORT_CHUNK = int(os.environ.get('IMPORT_CHUNK', 500))
+BACKUP_DIR = os.environ.get('BACKUP_DIR', os.path.join(os.path.dirname(DB_PATH) or '.', 'backups'))
+BACKUP_INTERVAL_SECONDS = int(os.environ.get('BACKUP_INTERVAL_SECONDS', 3600))
+BACKUP_KEEP = int(os.environ.get('BACKUP_KEEP', 24))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/html', 'text/css', 'text/javascript', 'application/javascript')
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STATIC_MAX_AGE = 365 * 24 * 3600
+SOCKETIO_CLIENT = 'vendor/socket.io.min.js'
+SOCKETIO_CLIENT_CDN = 'https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.5.0/socket.io.min.js'
+# SQLite's busy handler sleeps in C and would freeze every greenlet, so
+# connections only spin for DB_BUSY_POLL_MS; the writer retries the lock with
+# green sleeps for up to DB_BUSY_TIMEOUT_MS.
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+DB_BUSY_POLL_MS = int(os.environ.get('DB_BUSY_POLL_MS', 5))
+DB_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', int(os.environ.get('DB_CACHE_KB', 16384)) * -1),
+    ('mmap_size', int(os.environ.get('DB_MMAP_BYTES', 256 * 1024 * 1024))),
+    ('temp_store', 'MEMORY'),
+    ('busy_timeout', DB_BUSY_POLL_MS),
+)
+
 os.makedirs(os.path.dirname(DB_PATH) if os.path.dirname(DB_PATH) else '.', exist_ok=True)
 
+# Metrics, exported at /metrics. Gauges are registered next to the state they
+# read and only evaluated on scrape.
+registry = Registry()
+http_seconds = registry.histogram('kanban_http_request_duration_seconds', 'HTTP request latency by route', ('method', 'route', 'status'))
+http_auth_failures = registry.counter('kanban_http_auth_failures_total', 'API requests rejected by api_auth_required')
+socket_seconds = registry.histogram('kanban_socket_event_duration_seconds', 'Socket.IO handler latency by event', ('event',))
+socket_errors = registry.counter('kanban_socket_event_errors_total', 'Socket.IO handlers that raised', ('event',))
+task_op_seconds = registry.histogram('kanban_task_op_duration_seconds', 'Task helper latency, including the queued write', ('op',))
+db_query_seconds = registry.histogram('kanban_db_query_duration_seconds', 'SQLite statement execution time by statement kind', ('statement',), DB_BUCKETS)
+db_busy = registry.counter('kanban_db_busy_total', 'SQLite statements that failed with database is locked/busy')
+db_pool_wait_seconds = registry.histogram('kanban_db_pool_wait_seconds', 'Time spent waiting for a pooled connection', buckets=DB_BUCKETS)
+db_lock_wait_seconds = registry.histogram('kanban_db_lock_wait_seconds', 'Time to acquire the SQLite write lock (BEGIN IMMEDIATE)', buckets=DB_BUCKETS)
+write_batch_size = registry.histogram('kanban_write_batch_size', 'Writes committed per group-commit transaction', buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+broadcast_seconds = registry.histogram('kanban_broadcast_fanout_seconds', 'Time to emit one tasks_delta frame to its room')
+broadcast_tasks = registry.histogram('kanban_broadcast_frame_tasks', 'Tasks (upserts plus deletes) per broadcast frame', buckets=COUNT_BUCKETS)
+
+def timed(histogram, *labels):
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, *labels)
+        return wrapper
+    return decorator
+
+class InstrumentedConnection(sqlite3.Connection):
+    # Times each statement (labelled by its first keyword) and counts lock
+    # timeouts. Row fetching after the first step is not included.
+    def execute(self, sql, *args):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, *args)
+        except sqlite3.OperationalError as e:
+            if 'locked' in str(e) or 'busy' in str(e):
+                db_busy.inc()
+            raise
+        finally:
+            db_query_seconds.observe(time.perf_counter() - started, sql.split(None, 1)[0].upper())
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            db_query_seconds.observe(time.perf_counter() - started, 'COMMIT')
+
+class ConnectionPool:
+    # Bounded pool of configured connections. A connection is bound to the
+    # greenlet that checked it out, so nested get_db() calls share it.
+    def __init__(self, path, size=DB_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = []
+        self._owners = {}
+        self._slots = Semaphore(size)
+        self.journal_mode = None
+        self._counters = {'created': 0, 'reused': 0, 'checkouts': 0, 'waits': 0, 'discarded': 0}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=DB_STATEMENT_CACHE,
+                               factory=InstrumentedConnection)
+        conn.row_factory = sqlite3.Row
+        for name, value in DB_PRAGMAS:
+            conn.execute(f'PRAGMA {name} = {value}')
+        self.journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+        self._counters['created'] += 1
+        return conn
+
+    @contextmanager
+    def connection(self):
+        owner = getcurrent()
+        held = self._owners.get(owner)
+        if held is not None:
+            yield held
+            return
+        if not self._slots.acquire(blocking=False):
+            self._counters['waits'] += 1
+            started = time.perf_counter()
+            self._slots.acquire()
+            db_pool_wait_seconds.observe(time.perf_counter() - started)
+        try:
+            if self._idle:
+                conn = self._idle.pop()
+                self._counters['reused'] += 1
+            else:
+                conn = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+        self._counters['checkouts'] += 1
+        self._owners[owner] = conn
+        healthy = True
+        try:
+            yield conn
+        finally:
+            del self._owners[owner]
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                healthy = False
+            if healthy:
+                self._idle.append(conn)
+            else:
+                self._counters['discarded'] += 1
+                conn.close()
+            self._slots.release()
+
+    def stats(self):
+        return dict(
+            self._counters,
+            size=self.size,
+            idle=len(self._idle),
+            in_use=len(self._owners),
+            journal_mode=self.journal_mode,
+        )
+
+db_pool = ConnectionPool(DB_PATH)
+registry.gauge('kanban_db_pool_connections', 'Pooled SQLite connections by state',
+               lambda: {'in_use': len(db_pool._owners), 'idle': len(db_pool._idle)}, ('state',))
+
 def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return db_pool.connection()
+
+class WriteQueue:
+    # Single writer greenlet. Mutations queued by any greenlet are applied in
+    # one transaction per batch (group commit); each op gets its own savepoint
+    # so a failing op only fails its caller.
+    def __init__(self, pool, max_batch=WRITE_BATCH_SIZE):
+        self.pool = pool
+        self.max_batch = max_batch
+        self._pending = LightQueue()
+        self._writer = None
+        self._counters = {'writes': 0, 'failed': 0, 'batches': 0, 'largest_batch': 0}
+
+    def submit(self, op, *args):
+        done = Event()
+        self._pending.put((op, args, done))
+        if self._writer is None or self._writer.dead:
+            self._writer = eventlet.spawn(self._run)
+        return done.wait()
+
+    def _run(self):
+        while True:
+            batch = [self._pending.get()]
+            while len(batch) < self.max_batch and not self._pending.empty():
+                batch.append(self._pending.get_nowait())
+            self._commit(batch)
+
+    def _begin(self, conn):
+        # Another worker process may hold the write lock; wait for it with
+        # green sleeps so this process keeps serving meanwhile.
+        deadline = time.monotonic() + DB_BUSY_TIMEOUT_MS / 1000
+        delay = 0.001
+        while True:
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                return
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) and 'busy' not in str(e) or time.monotonic() >= deadline:
+                    raise
+            eventlet.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    def _commit(self, batch):
+        outcomes = []
+        try:
+            with self.pool.connection() as conn:
+                started = time.perf_counter()
+                self._begin(conn)
+                db_lock_wait_seconds.observe(time.perf_counter() - started)
+                for op, args, done in batch:
+                    conn.execute('SAVEPOINT write_op')
+                    try:
+                        outcomes.append((done, op(conn, *args), None))
+                    except Exception as e:
+                        conn.execute('ROLLBACK TO write_op')
+                        outcomes.append((done, None, e))
+                    conn.execute('RELEASE write_op')
+                conn.commit()
+        except Exception as e:
+            self._counters['failed'] += len(batch)
+            for _, _, done in batch:
+                done.send_exception(e)
+            return
+        self._counters['batches'] += 1
+        write_batch_size.observe(len(batch))
+        self._counters['largest_batch'] = max(self._counters['largest_batch'], len(batch))
+        for done, result, error in outcomes:
+            if error is None:
+                self._counters['writes'] += 1
+                done.send(result)
+            else:
+                self._counters['failed'] += 1
+                done.send_exception(error)
+
+    def stats(self):
+        return dict(self._counters, pending=self._pending.qsize(), max_batch=self.max_batch)
+
+writer = WriteQueue(db_pool)
+registry.gauge('kanban_write_queue_pending', 'Writes waiting for the writer greenlet', lambda: {(): writer._pending.qsize()})
+
+def _columns(conn, table):
+    return {r['name'] for r in conn.execute(f'PRAGMA table_info({table})')}
+
+def _ensure_column(conn, table, column, decl):
+    if column not in _columns(conn, table):
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {decl}')
 
 def init_db():
-    conn = get_db()
+    # Every worker runs this at boot, possibly against the same fresh file.
+    # The schema is applied in one write transaction, waiting for the lock in
+    # SQLite's busy handler: nothing is being served yet, so blocking is fine.
+    with get_db() as conn:
+        conn.execute(f'PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}')
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            _init_schema(conn)
+            conn.commit()
+        finally:
+            conn.execute(f'PRAGMA busy_timeout = {DB_BUSY_POLL_MS}')
+
+def _init_schema(conn):
     conn.execute('''
         CREATE TABLE IF NOT EXISTS tasks (
             id TEXT PRIMARY KEY,
@@ -40,8 +346,140 @@ def init_db():
             source TEXT DEFAULT 'app'
         )
     ''')
-    conn.commit()
-    conn.close()
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_updated ON tasks (updated_at)')
+    _ensure_column(conn, 'tasks', 'revision', 'INTEGER DEFAULT 0')
+    _ensure_column(conn, 'tasks', 'board_id', f"TEXT NOT NULL DEFAULT '{DEFAULT_BOARD}'")
+    # Board-scoped reads lead with board_id; the global indexes they
+    # replace would only cost writes.
+    for name in ('idx_tasks_created', 'idx_tasks_status_created', 'idx_tasks_revision'):
+        conn.execute(f'DROP INDEX IF EXISTS {name}')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_board_created ON tasks (board_id, created_at DESC, id DESC)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_board_status_created ON tasks (board_id, status, created_at DESC, id DESC)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_board_revision ON tasks (board_id, revision)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS task_changes (
+            revision INTEGER PRIMARY KEY,
+            task_id TEXT NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TEXT
+        )
+    ''')
+    _ensure_column(conn, 'task_changes', 'board_id', f"TEXT NOT NULL DEFAULT '{DEFAULT_BOARD}'")
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_task_changes_board ON task_changes (board_id, revision)')
+    conn.execute('CREATE TABLE IF NOT EXISTS board_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+    conn.execute("INSERT OR IGNORE INTO board_meta (key, value) VALUES ('revision', 0), ('compacted_revision', 0)")
+    _init_search(conn)
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status_updated ON tasks (status, updated_at)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tasks_archive (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT,
+            priority TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            source TEXT,
+            revision INTEGER,
+            archived_at TEXT NOT NULL
+        )
+    ''')
+    _ensure_column(conn, 'tasks_archive', 'board_id', f"TEXT NOT NULL DEFAULT '{DEFAULT_BOARD}'")
+    conn.execute('DROP INDEX IF EXISTS idx_tasks_archive_archived')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_archive_board ON tasks_archive (board_id, archived_at DESC, id DESC)')
+    _init_stats(conn)
+
+def _init_stats(conn):
+    # Stats are kept per board. Tables from before that are migrated in place:
+    # counters are rebuilt from tasks, history and durations follow their
+    # task's board, and daily totals (which cannot be split) stay on the
+    # default board.
+    if 'board_id' not in _columns(conn, 'board_counters'):
+        conn.execute('DROP TABLE IF EXISTS board_counters')
+    if _columns(conn, 'daily_throughput') and 'board_id' not in _columns(conn, 'daily_throughput'):
+        conn.execute('ALTER TABLE daily_throughput RENAME TO daily_throughput_old')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS task_status_history (
+            id INTEGER PRIMARY KEY,
+            task_id TEXT NOT NULL,
+            from_status TEXT,
+            to_status TEXT NOT NULL,
+            changed_at TEXT NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_status_history_task ON task_status_history (task_id, to_status)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS board_counters (
+            board_id TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (board_id, dimension, key)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS daily_throughput (
+            board_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            created INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (board_id, day)
+        ) WITHOUT ROWID
+    ''')
+    if _columns(conn, 'daily_throughput_old'):
+        conn.execute('INSERT INTO daily_throughput SELECT ?, day, created, completed FROM daily_throughput_old', (DEFAULT_BOARD,))
+        conn.execute('DROP TABLE daily_throughput_old')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS task_durations (
+            task_id TEXT PRIMARY KEY,
+            completed_at TEXT NOT NULL,
+            lead_seconds REAL NOT NULL,
+            cycle_seconds REAL
+        )
+    ''')
+    for table in ('task_status_history', 'task_durations'):
+        if 'board_id' not in _columns(conn, table):
+            _ensure_column(conn, table, 'board_id', f"TEXT NOT NULL DEFAULT '{DEFAULT_BOARD}'")
+            conn.execute(f'''
+                UPDATE {table} SET board_id = COALESCE(
+                    (SELECT board_id FROM tasks WHERE tasks.id = {table}.task_id),
+                    (SELECT board_id FROM tasks_archive WHERE tasks_archive.id = {table}.task_id),
+                    board_id)
+            ''')
+    conn.execute('DROP INDEX IF EXISTS idx_task_durations_completed')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_task_durations_board_completed ON task_durations (board_id, completed_at)')
+    for dimension in STATS_DIMENSIONS:
+        if not conn.execute('SELECT 1 FROM board_counters WHERE dimension = ? LIMIT 1', (dimension,)).fetchone():
+            conn.execute(f"INSERT INTO board_counters SELECT board_id, ?, COALESCE({dimension}, ''), COUNT(*) FROM tasks GROUP BY 1, 3",
+                         (dimension,))
+
+def _init_search(conn):
+    # External-content FTS5 index over tasks, kept in sync by triggers.
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'").fetchone()
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            title, description, content='tasks', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+            INSERT INTO tasks_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+        END
+    ''')
+    if not exists:
+        conn.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
 
 init_db()
 
@@ -62,44 +500,1033 @@ def api_auth_required(f):
         auth = request.authorization
         if auth and auth.username == AUTH_USER and auth.password == AUTH_PASS:
             return f(*args, **kwargs)
+        http_auth_failures.inc()
         return jsonify({'error': 'Unauthorized'}), 401
     return decorated_function
 
-def get_all_tasks():
-    conn = get_db()
-    tasks = conn.execute('SELECT * FROM tasks ORDER BY created_at DESC').fetchall()
-    conn.close()
-    return [dict(t) for t in tasks]
+def _board_meta(conn):
+    return {r['key']: r['value'] for r in conn.execute('SELECT key, value FROM board_meta')}
 
-def create_task(title, description='', status='todo', priority='medium', source='app'):
-    task_id = str(uuid.uuid4())[:8]
-    now = datetime.now().isoformat()
-    conn = get_db()
+def _snapshot(conn, board_id, revision):
+    tasks = conn.execute('SELECT * FROM tasks WHERE board_id = ? ORDER BY created_at DESC, id DESC', (board_id,)).fetchall()
+    return {'revision': revision, 'full': True, 'tasks': [dict(t) for t in tasks], 'deleted': []}
+
+def get_board_snapshot(board_id=DEFAULT_BOARD):
+    with get_db() as conn:
+        conn.execute('BEGIN')
+        return _snapshot(conn, board_id, _board_meta(conn)['revision'])
+
+@timed(task_op_seconds, 'changes')
+def get_changes_since(since, board_id=DEFAULT_BOARD):
+    # Inserts/updates and tombstones on one board after `since`, or a full
+    # snapshot when the change log no longer reaches back that far. Revisions
+    # are shared by all boards.
+    with get_db() as conn:
+        conn.execute('BEGIN')
+        meta = _board_meta(conn)
+        if since is None or since <= meta['compacted_revision'] or since > meta['revision']:
+            return _snapshot(conn, board_id, meta['revision'])
+        tasks = [dict(t) for t in conn.execute(
+            'SELECT * FROM tasks WHERE board_id = ? AND revision > ? ORDER BY revision', (board_id, since))]
+        live = {t['id'] for t in tasks}
+        deleted = [r['task_id'] for r in conn.execute(
+            "SELECT DISTINCT task_id FROM task_changes WHERE board_id = ? AND revision > ? AND op IN ('delete', 'archive')",
+            (board_id, since)
+        ) if r['task_id'] not in live]
+    return {'revision': meta['revision'], 'full': False, 'tasks': tasks, 'deleted': deleted}
+
+TASK_FIELDS = ('title', 'description', 'status', 'priority', 'source')
+
+class BoardCache:
+    # Write-through copy of one board, partitioned by status and indexed by
+    # id. Ordered views and the serialized snapshot are rebuilt lazily after
+    # a mutation and reused until the next one.
+    def __init__(self, board_id=DEFAULT_BOARD):
+        self.board_id = board_id
+        self.revision = 0
+        self._by_id = {}
+        self._by_status = {}
+        self._views = {}
+        self._json = None
+        self._html = None
+        self._encoded = {}
+        self._last_modified = None
+        self._counters = {'view_hits': 0, 'view_builds': 0, 'json_hits': 0, 'json_builds': 0, 'loads': 0, 'syncs': 0}
+
+    def load(self, snapshot=None):
+        snapshot = snapshot or get_board_snapshot(self.board_id)
+        self._by_id, self._by_status = {}, {}
+        for task in snapshot['tasks']:
+            self._by_id[task['id']] = task
+            self._by_status.setdefault(task['status'], {})[task['id']] = task
+        self.revision = snapshot['revision']
+        self._invalidate()
+        self._counters['loads'] += 1
+
+    def sync(self):
+        # Other workers write to the same database: catch up from the change
+        # log before serving a read.
+        if not SHARED_BOARD:
+            return
+        changes = get_changes_since(self.revision, self.board_id)
+        if changes['full']:
+            self.load(changes)
+            return
+        for task in changes['tasks']:
+            self.put(task)
+        for task_id in changes['deleted']:
+            self.remove(task_id)
+        self.revision = changes['revision']
+        self._counters['syncs'] += 1
+        release_board(self)
+
+    def _invalidate(self):
+        self._views = {}
+        self._json = None
+        self._html = None
+        self._encoded = {}
+
+    def put(self, task):
+        current = self._by_id.get(task['id'])
+        if current is not None:
+            if current['revision'] > task['revision']:
+                return
+            self._by_status[current['status']].pop(task['id'], None)
+        self._by_id[task['id']] = task
+        self._by_status.setdefault(task['status'], {})[task['id']] = task
+        self._advance(task['revision'])
+        self._invalidate()
+
+    def remove(self, task_id, revision=None):
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            self._by_status[task['status']].pop(task_id, None)
+            self._invalidate()
+        if revision:
+            self._advance(revision)
+
+    def _advance(self, revision):
+        # With a shared board other workers may own the revisions in between;
+        # only sync() may move past them.
+        if not SHARED_BOARD:
+            self.revision = max(self.revision, revision)
+
+    def tasks(self, status=None):
+        view = self._views.get(status)
+        if view is not None:
+            self._counters['view_hits'] += 1
+            return view
+        self._counters['view_builds'] += 1
+        source = self._by_id if status is None else self._by_status.get(status, {})
+        view = sorted(source.values(), key=lambda t: (t['created_at'], t['id']), reverse=True)
+        self._views[status] = view
+        return view
+
+    def get(self, task_id):
+        return self._by_id.get(task_id)
+
+    def snapshot_json(self):
+        if self._json is not None:
+            self._counters['json_hits'] += 1
+            return self._json
+        self._counters['json_builds'] += 1
+        self._json = json.dumps(self.tasks()).encode()
+        return self._json
+
+    def snapshot_html(self):
+        # The snapshot escaped for embedding in a <script> element.
+        if self._html is None:
+            self._html = self.snapshot_json().decode().replace('<', '\\u003c')
+        return self._html
+
+    def snapshot_encoded(self, encoding):
+        if encoding is None:
+            return self.snapshot_json()
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress_body(self.snapshot_json(), encoding)
+        return body
+
+    def last_modified(self):
+        if self._last_modified is None or self._last_modified[0] != self.revision:
+            with get_db() as conn:
+                row = conn.execute('SELECT changed_at FROM task_changes WHERE board_id = ? AND revision <= ? ORDER BY revision DESC LIMIT 1',
+                                   (self.board_id, self.revision)).fetchone()
+                changed_at = row['changed_at'] if row else conn.execute(
+                    'SELECT MAX(updated_at) FROM tasks WHERE board_id = ?', (self.board_id,)).fetchone()[0]
+            changed = datetime.fromisoformat(changed_at) if changed_at else datetime.fromtimestamp(0)
+            self._last_modified = (self.revision, changed.astimezone(timezone.utc))
+        return self._last_modified[1]
+
+    def stats(self):
+        return dict(
+            self._counters,
+            board_id=self.board_id,
+            revision=self.revision,
+            tasks=len(self._by_id),
+            by_status={status: len(tasks) for status, tasks in self._by_status.items()},
+            snapshot_bytes=len(self._json) if self._json is not None else None,
+        )
+
+board_caches = {}
+
+def get_board(board_id=DEFAULT_BOARD):
+    # Boards are loaded on first read; a concurrent first read keeps whichever
+    # copy was registered first. A board without tasks is served but not
+    # kept, so reads of arbitrary ids don't pin memory or metric labels.
+    cache = board_caches.get(board_id)
+    if cache is None:
+        cache = BoardCache(board_id)
+        cache.load()
+        if cache._by_id:
+            cache = board_caches.setdefault(board_id, cache)
+    return cache
+
+def release_board(cache):
+    # Drops a board that has become empty; the next read reloads it.
+    if not cache._by_id and board_caches.get(cache.board_id) is cache:
+        del board_caches[cache.board_id]
+        board_stats.forget(cache.board_id)
+
+def cached_board(board_id):
+    # Write-through target, or None when nobody has read the board yet (the
+    # first get_board() will load it including the write).
+    return board_caches.get(board_id)
+
+get_board()
+registry.gauge('kanban_board_cache_tasks', 'Tasks held in the in-memory cache by board',
+               lambda: {board_id: len(cache._by_id) for board_id, cache in board_caches.items()}, ('board',))
+
+def _log_change(conn, task_id, op, board_id):
+    # Bumps the board revision and records the change in the same transaction
+    # as the mutation, trimming the log to CHANGELOG_RETENTION entries.
+    revision = conn.execute("UPDATE board_meta SET value = value + 1 WHERE key = 'revision' RETURNING value").fetchone()[0]
+    conn.execute('INSERT INTO task_changes (revision, task_id, op, changed_at, board_id) VALUES (?, ?, ?, ?, ?)',
+                 (revision, task_id, op, datetime.now().isoformat(), board_id))
+    if revision % CHANGELOG_COMPACT_EVERY == 0 and revision > CHANGELOG_RETENTION:
+        compacted = revision - CHANGELOG_RETENTION
+        conn.execute('DELETE FROM task_changes WHERE revision <= ?', (compacted,))
+        conn.execute("UPDATE board_meta SET value = ? WHERE key = 'compacted_revision'", (compacted,))
+    return revision
+
+def _count(conn, task, delta):
+    for dimension in STATS_DIMENSIONS:
+        conn.execute(
+            'INSERT INTO board_counters (board_id, dimension, key, count) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (board_id, dimension, key) DO UPDATE SET count = count + excluded.count',
+            (task['board_id'], dimension, task[dimension] or '', delta)
+        )
+
+def _count_day(conn, board_id, day, column):
+    conn.execute(
+        f'INSERT INTO daily_throughput (board_id, day, {column}) VALUES (?, ?, 1) '
+        f'ON CONFLICT (board_id, day) DO UPDATE SET {column} = {column} + 1',
+        (board_id, day)
+    )
+
+def _record_status(conn, task, from_status):
+    # Appends the transition and, on arrival in done, the lead/cycle time.
+    now = task['updated_at']
+    conn.execute('INSERT INTO task_status_history (task_id, from_status, to_status, changed_at, board_id) VALUES (?, ?, ?, ?, ?)',
+                 (task['id'], from_status, task['status'], now, task['board_id']))
+    if task['status'] == 'done':
+        started = conn.execute("SELECT MIN(changed_at) FROM task_status_history WHERE task_id = ? AND to_status = 'doing'",
+                               (task['id'],)).fetchone()[0]
+        finished = datetime.fromisoformat(now)
+        conn.execute(
+            'INSERT OR REPLACE INTO task_durations (task_id, completed_at, lead_seconds, cycle_seconds, board_id) VALUES (?, ?, ?, ?, ?)',
+            (task['id'], now, (finished - datetime.fromisoformat(task['created_at'])).total_seconds(),
+             (finished - datetime.fromisoformat(started)).total_seconds() if started else None, task['board_id'])
+        )
+        _count_day(conn, task['board_id'], now[:10], 'completed')
+    elif from_status == 'done':
+        conn.execute('DELETE FROM task_durations WHERE task_id = ?', (task['id'],))
+
+def _insert_task(conn, task):
+    revision = _log_change(conn, task['id'], 'create', task['board_id'])
+    row = dict(conn.execute(
+        'INSERT INTO tasks (id, title, description, status, priority, created_at, updated_at, source, revision, board_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) RETURNING *',
+        (task['id'], task['title'], task['description'], task['status'], task['priority'], task['created_at'], task['updated_at'], task['source'], revision, task['board_id'])
+    ).fetchone())
+    _count(conn, row, 1)
+    _count_day(conn, row['board_id'], row['created_at'][:10], 'created')
+    _record_status(conn, row, None)
+    return row
+
+def _update_task(conn, task_id, fields, board_id):
+    old = conn.execute('SELECT * FROM tasks WHERE id = ? AND board_id = ?', (task_id, board_id)).fetchone()
+    if old is None:
+        return None
+    sets = ', '.join(f'{k} = ?' for k in fields.keys())
+    values = list(fields.values()) + [task_id]
+    row = dict(conn.execute(
+        f"UPDATE tasks SET {sets}, revision = (SELECT value + 1 FROM board_meta WHERE key = 'revision') WHERE id = ? RETURNING *",
+        values
+    ).fetchone())
+    if any(old[d] != row[d] for d in STATS_DIMENSIONS):
+        _count(conn, old, -1)
+        _count(conn, row, 1)
+    if old['status'] != row['status']:
+        _record_status(conn, row, old['status'])
+    _log_change(conn, task_id, 'update', board_id)
+    return row
+
+def _delete_task(conn, task_id, board_id):
+    old = conn.execute('DELETE FROM tasks WHERE id = ? AND board_id = ? RETURNING *', (task_id, board_id)).fetchone()
+    if old is None:
+        return None
+    _count(conn, old, -1)
+    return _log_change(conn, task_id, 'delete', board_id)
+
+def _store_archived(conn, task, revision, archived_at):
     conn.execute(
-        'INSERT INTO tasks (id, title, description, status, priority, created_at, updated_at, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
-        (task_id, title, description, status, priority, now, now, source)
+        'INSERT OR REPLACE INTO tasks_archive (id, title, description, status, priority, created_at, updated_at, source, revision, archived_at, board_id) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (task['id'], task['title'], task['description'], task['status'], task['priority'], task['created_at'], task['updated_at'], task['source'], revision, archived_at, task['board_id'])
     )
-    conn.commit()
-    task = conn.execute('SELECT * FROM tasks WHERE id = ?', (task_id,)).fetchone()
-    conn.close()
-    return dict(task)
-
-def update_task(task_id, **kwargs):
-    conn = get_db()
-    kwargs['updated_at'] = datetime.now().isoformat()
-    sets = ', '.join(f'{k} = ?' for k in kwargs.keys())
-    values = list(kwargs.values()) + [task_id]
-    conn.execute(f'UPDATE tasks SET {sets} WHERE id = ?', values)
-    conn.commit()
-    task = conn.execute('SELECT * FROM tasks WHERE id = ?', (task_id,)).fetchone()
-    conn.close()
-    return dict(task) if task else None
-
-def delete_task(task_id):
-    conn = get_db()
-    conn.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
-    conn.commit()
-    conn.close()
+
+def _archive_tasks(conn, cutoff, limit):
+    rows = conn.execute("SELECT * FROM tasks WHERE status = 'done' AND updated_at < ? ORDER BY updated_at LIMIT ?",
+                        (cutoff, limit)).fetchall()
+    now = datetime.now().isoformat()
+    archived = []
+    for row in rows:
+        _store_archived(conn, row, row['revision'], now)
+        conn.execute('DELETE FROM tasks WHERE id = ?', (row['id'],))
+        _count(conn, row, -1)
+        archived.append((row['id'], _log_change(conn, row['id'], 'archive', row['board_id']), row['board_id']))
+    return archived
+
+def _apply_batch(conn, operations, board_id):
+    result = {'board_id': board_id, 'created': [], 'updated': [], 'deleted': []}
+    for op in operations:
+        if op['op'] == 'create':
+            result['created'].append(_insert_task(conn, op['task']))
+        elif op['op'] == 'update':
+            task = _update_task(conn, op['id'], op['fields'], board_id)
+            if task is None:
+                raise LookupError(f"Task {op['id']} not found")
+            result['updated'].append(task)
+        else:
+            if _delete_task(conn, op['id'], board_id) is not None:
+                result['deleted'].append(op['id'])
+    result['revision'] = _board_meta(conn)['revision']
+    return result
+
+def _new_task(title, description='', status='todo', priority='medium', source='app', board_id=DEFAULT_BOARD):
+    now = datetime.now().isoformat()
+    return {'id': str(uuid.uuid4())[:8], 'title': title, 'description': description, 'status': status,
+            'priority': priority, 'created_at': now, 'updated_at': now, 'source': source, 'board_id': board_id}
+
+def _update_fields(kwargs):
+    fields = {k: v for k, v in kwargs.items() if k in TASK_FIELDS}
+    fields['updated_at'] = datetime.now().isoformat()
+    return fields
+
+def _write_through(board_id, tasks=(), deleted=(), revision=None):
+    cache = cached_board(board_id)
+    if cache is None:
+        return
+    for task in tasks:
+        cache.put(task)
+    for task_id in deleted:
+        cache.remove(task_id, revision)
+    release_board(cache)
+
+@timed(task_op_seconds, 'create')
+def create_task(title, description='', status='todo', priority='medium', source='app', board_id=DEFAULT_BOARD):
+    task = writer.submit(_insert_task, _new_task(title, description, status, priority, source, board_id))
+    _write_through(board_id, [task])
+    return task
+
+@timed(task_op_seconds, 'update')
+def update_task(task_id, fields, board_id=DEFAULT_BOARD):
+    task = writer.submit(_update_task, task_id, _update_fields(fields), board_id)
+    if task:
+        _write_through(board_id, [task])
+    return task
+
+@timed(task_op_seconds, 'delete')
+def delete_task(task_id, board_id=DEFAULT_BOARD):
+    revision = writer.submit(_delete_task, task_id, board_id)
+    _write_through(board_id, deleted=[task_id], revision=revision)
+    return revision
+
+@timed(task_op_seconds, 'batch')
+def apply_batch(operations, source='app', board_id=DEFAULT_BOARD):
+    # Mixed create/update/delete ops applied all-or-nothing in one write.
+    if not isinstance(operations, list) or not operations:
+        raise ValueError('operations must be a non-empty list')
+    if len(operations) > BATCH_MAX_OPS:
+        raise ValueError(f'At most {BATCH_MAX_OPS} operations per batch')
+    ops = []
+    for i, op in enumerate(operations):
+        kind = op.get('op') if isinstance(op, dict) else None
+        if kind == 'create':
+            if not op.get('title'):
+                raise ValueError(f'Operation {i}: title is required')
+            ops.append({'op': 'create', 'task': _new_task(
+                op['title'], op.get('description', ''), op.get('status', 'todo'),
+                op.get('priority', 'medium'), op.get('source', source), board_id)})
+        elif kind in ('update', 'delete'):
+            if not op.get('id'):
+                raise ValueError(f'Operation {i}: id is required')
+            ops.append({'op': kind, 'id': op['id'], 'fields': _update_fields(op) if kind == 'update' else None})
+        else:
+            raise ValueError(f'Operation {i}: op must be create, update or delete')
+    result = writer.submit(_apply_batch, ops, board_id)
+    _write_through(board_id, result['created'] + result['updated'], result['deleted'], result['revision'])
+    return result
+
+def _import_archived(conn, task, result, compared):
+    # An archived row goes back to tasks_archive; if the task is live here it
+    # leaves its board the way the archiver would take it.
+    old = conn.execute('SELECT * FROM tasks_archive WHERE id = ?', (task['id'],)).fetchone()
+    live = conn.execute('SELECT * FROM tasks WHERE id = ?', (task['id'],)).fetchone()
+    if live is None and old is not None and all(old[k] == task[k] for k in compared + ('board_id', 'archived_at')):
+        result['unchanged'] += 1
+        return
+    if live is not None:
+        conn.execute('DELETE FROM tasks WHERE id = ?', (task['id'],))
+        _count(conn, live, -1)
+        result['moved'].append((task['id'], live['board_id'], _log_change(conn, task['id'], 'archive', live['board_id'])))
+    _store_archived(conn, task, live['revision'] if live else old['revision'] if old else 0, task['archived_at'])
+    result['archived'] += 1
+
+def _import_tasks(conn, tasks):
+    # Upsert by id. Identical rows are left alone, so re-importing an export
+    # is a no-op; a task that changed board is deleted from the old one, and
+    # a live row replaces an archived copy of the same task.
+    result = {'created': [], 'updated': [], 'moved': [], 'archived': 0, 'unchanged': 0}
+    compared = TASK_FIELDS + ('updated_at',)
+    for task in tasks:
+        if task.get('archived_at'):
+            _import_archived(conn, task, result, compared)
+            continue
+        old = conn.execute('SELECT * FROM tasks WHERE id = ?', (task['id'],)).fetchone()
+        if old is not None and old['board_id'] != task['board_id']:
+            result['moved'].append((task['id'], old['board_id'], _delete_task(conn, task['id'], old['board_id'])))
+            old = None
+        if old is None:
+            conn.execute('DELETE FROM tasks_archive WHERE id = ?', (task['id'],))
+            result['created'].append(_insert_task(conn, task))
+        elif all(old[k] == task[k] for k in compared):
+            result['unchanged'] += 1
+        else:
+            result['updated'].append(_update_task(conn, task['id'], {k: task[k] for k in compared}, task['board_id']))
+    return result
+
+def _local_timestamp(value):
+    # The app stores naive local ISO timestamps, compared as strings and
+    # subtracted as datetimes; aware values are converted to that form.
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat()
+
+IMPORT_FIELDS = TASK_FIELDS + ('id', 'board_id', 'created_at', 'updated_at', 'archived_at')
+
+def _import_row(data):
+    if not isinstance(data, dict) or not data.get('title'):
+        raise ValueError('title is required')
+    for key in IMPORT_FIELDS:
+        if data.get(key) is not None and not isinstance(data[key], str):
+            raise TypeError(f'{key} must be a string')
+    if not isinstance(data.get('archived', False), bool):
+        raise TypeError('archived must be a boolean')
+    task = _new_task(data['title'], data.get('description') or '', data.get('status') or 'todo',
+                     data.get('priority') or 'medium', data.get('source') or 'import', data.get('board_id') or DEFAULT_BOARD)
+    if not re.fullmatch(BOARD_ID_PATTERN, task['board_id']):
+        raise ValueError('invalid board_id')
+    if data.get('id'):
+        task['id'] = data['id']
+    for key in ('created_at', 'updated_at'):
+        if data.get(key):
+            task[key] = _local_timestamp(data[key])
+    if data.get('archived'):
+        task['archived_at'] = _local_timestamp(data['archived_at']) if data.get('archived_at') else datetime.now().isoformat()
+    return task
+
+@timed(task_op_seconds, 'import')
+def import_tasks(lines, chunk=IMPORT_CHUNK):
+    # NDJSON upsert in one writer op per chunk, so other writes interleave
+    # between chunks. Stops at the first bad line or failed chunk; everything
+    # before it is committed and reported.
+    result = {'created': 0, 'updated': 0, 'archived': 0, 'unchanged': 0, 'boards': set()}
+    pending = []
+    first_line = None
+
+    def flush():
+        # Earlier chunks are already committed, so any failure here is
+        # reported with the counts rather than turned into a 500.
+        try:
+            applied = writer.submit(_import_tasks, pending)
+        except Exception as e:
+            if not isinstance(e, sqlite3.Error):
+                app.logger.exception('import chunk failed')
+            result['error'], result['line'] = f'chunk starting at line {first_line} was not applied: {e}', first_line
+            pending.clear()
+            return False
+        for task in applied['created'] + applied['updated']:
+            _write_through(task['board_id'], [task])
+            result['boards'].add(task['board_id'])
+        for task_id, board_id, revision in applied['moved']:
+            _write_through(board_id, deleted=[task_id], revision=revision)
+            result['boards'].add(board_id)
+        result['created'] += len(applied['created'])
+        result['updated'] += len(applied['updated'])
+        result['archived'] += applied['archived']
+        result['unchanged'] += applied['unchanged']
+        pending.clear()
+        return True
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            task = _import_row(json.loads(line))
+        except (ValueError, TypeError) as e:
+            result['error'], result['line'] = str(e), number
+            break
+        if not pending:
+            first_line = number
+        pending.append(task)
+        if len(pending) >= chunk and not flush():
+            break
+    if pending:
+        flush()
+    result['boards'] = sorted(result['boards'])
+    return result
+
+def export_tasks(board_id=None, include_archived=True):
+    # Every task (optionally of one board): live ones, then archived ones
+    # tagged "archived": true so an import puts them back in the archive.
+    yield from _export_rows('tasks', board_id)
+    if include_archived:
+        for row in _export_rows('tasks_archive', board_id):
+            row['archived'] = True
+            yield row
+
+def _export_rows(table, board_id):
+    # Rows in id order, read in short keyset chunks so memory stays flat
+    # however large the board is.
+    after = ''
+    while True:
+        sql, params = f'SELECT * FROM {table} WHERE id > ?', [after]
+        if board_id is not None:
+            sql += ' AND board_id = ?'
+            params.append(board_id)
+        with get_db() as conn:
+            rows = conn.execute(sql + ' ORDER BY id LIMIT ?', params + [STREAM_CHUNK]).fetchall()
+        for row in rows:
+            yield dict(row)
+        if len(rows) < STREAM_CHUNK:
+            return
+        after = rows[-1]['id']
+
+TASK_COLUMNS = ('id',) + TASK_FIELDS + ('created_at', 'updated_at', 'revision', 'board_id')
+
+def encode_cursor(created_at, task_id):
+    return base64.urlsafe_b64encode(json.dumps([created_at, task_id]).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(value, list) or len(value) != 2 or not all(isinstance(v, str) for v in value):
+        raise ValueError('Invalid cursor')
+    return value[0], value[1]
+
+def _task_filters(board_id=DEFAULT_BOARD, status=None, priority=None, source=None, updated_since=None):
+    where, params = ['board_id = ?'], [board_id]
+    for column, values in (('status', status), ('priority', priority), ('source', source)):
+        if values:
+            where.append(f'{column} IN ({", ".join("?" * len(values))})')
+            params.extend(values)
+    if updated_since:
+        where.append('updated_at >= ?')
+        params.append(updated_since)
+    return where, params
+
+def _keyset_query(columns, where, params, after, limit):
+    where, params = list(where), list(params)
+    if after:
+        where.append('(created_at, id) < (?, ?)')
+        params.extend(after)
+    sql = f'SELECT {", ".join(columns)} FROM tasks WHERE ' + ' AND '.join(where)
+    return sql + ' ORDER BY created_at DESC, id DESC LIMIT ?', params + [limit]
+
+def iter_tasks(filters=None, fields=None, after=None):
+    # Keyset-paged scan; each chunk is its own short read so a slow consumer
+    # never pins a pooled connection.
+    where, params = _task_filters(**(filters or {}))
+    columns = list(fields or TASK_COLUMNS)
+    extra = [c for c in ('created_at', 'id') if c not in columns]
+    while True:
+        sql, args = _keyset_query(columns + extra, where, params, after, STREAM_CHUNK)
+        with get_db() as conn:
+            rows = conn.execute(sql, args).fetchall()
+        for row in rows:
+            task = dict(row)
+            after = (task['created_at'], task['id'])
+            for c in extra:
+                del task[c]
+            yield task
+        if len(rows) < STREAM_CHUNK:
+            return
+
+def fetch_task_page(filters=None, fields=None, after=None, limit=100):
+    # One read of limit + 1 rows: the page and its cursor come from the same
+    # snapshot, so concurrent writes can't skip or repeat rows across pages.
+    where, params = _task_filters(**(filters or {}))
+    columns = list(fields or TASK_COLUMNS)
+    extra = [c for c in ('created_at', 'id') if c not in columns]
+    sql, args = _keyset_query(columns + extra, where, params, after, limit + 1)
+    with get_db() as conn:
+        rows = conn.execute(sql, args).fetchall()
+    cursor = encode_cursor(rows[limit - 1]['created_at'], rows[limit - 1]['id']) if len(rows) > limit else None
+    tasks = []
+    for row in rows[:limit]:
+        task = dict(row)
+        for c in extra:
+            del task[c]
+        tasks.append(task)
+    return tasks, cursor
+
+def _percentiles(values):
+    if not values:
+        return {'p50': None, 'p85': None, 'p95': None, 'samples': 0}
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {'p50': pick(0.50), 'p85': pick(0.85), 'p95': pick(0.95), 'samples': len(values)}
+
+class BoardStats:
+    # /api/stats payloads assembled from the incrementally maintained tables,
+    # reused until the board's revision changes. Only boards held in
+    # board_caches keep a payload.
+    def __init__(self):
+        self._cached = {}
+
+    def forget(self, board_id):
+        self._cached.pop(board_id, None)
+
+    def get(self, board_id, revision):
+        cached = self._cached.get(board_id)
+        if cached is not None and cached['revision'] == revision:
+            return cached
+        with get_db() as conn:
+            counts = {dimension: {} for dimension in STATS_DIMENSIONS}
+            for row in conn.execute('SELECT dimension, key, count FROM board_counters WHERE board_id = ? AND count != 0', (board_id,)):
+                counts.setdefault(row['dimension'], {})[row['key']] = row['count']
+            throughput = [dict(r) for r in conn.execute(
+                'SELECT day, created, completed FROM daily_throughput WHERE board_id = ? ORDER BY day DESC LIMIT ?',
+                (board_id, STATS_DAYS))]
+            durations = conn.execute(
+                'SELECT lead_seconds, cycle_seconds FROM task_durations WHERE board_id = ? ORDER BY completed_at DESC LIMIT ?',
+                (board_id, STATS_SAMPLE)
+            ).fetchall()
+        cached = {
+            'board_id': board_id,
+            'revision': revision,
+            'total': sum(counts['status'].values()),
+            'counts': counts,
+            'throughput': throughput[::-1],
+            'lead_time_seconds': _percentiles([d['lead_seconds'] for d in durations]),
+            'cycle_time_seconds': _percentiles([d['cycle_seconds'] for d in durations if d['cycle_seconds'] is not None]),
+        }
+        if board_id in board_caches:
+            self._cached[board_id] = cached
+        return cached
+
+board_stats = BoardStats()
+
+def _fts_query(text):
+    # Every word becomes a quoted prefix term, so user input can never be
+    # parsed as FTS5 syntax.
+    terms = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{term}"*' for term in terms)
+
+@timed(task_op_seconds, 'search')
+def search_tasks(text, status=None, limit=20, board_id=DEFAULT_BOARD):
+    match = _fts_query(text)
+    if not match:
+        raise ValueError('q must contain at least one word')
+    limit = max(1, min(int(limit), SEARCH_MAX_RESULTS))
+    sql = '''
+        SELECT tasks.*,
+               snippet(tasks_fts, 0, '<mark>', '</mark>', '…', 12) AS title_highlight,
+               snippet(tasks_fts, 1, '<mark>', '</mark>', '…', 16) AS description_snippet,
+               bm25(tasks_fts, 5.0, 1.0) AS rank
+        FROM tasks_fts JOIN tasks ON tasks.rowid = tasks_fts.rowid
+        WHERE tasks_fts MATCH ? AND tasks.board_id = ?
+    '''
+    params = [match, board_id]
+    if status:
+        sql += f' AND tasks.status IN ({", ".join("?" * len(status))})'
+        params.extend(status)
+    with get_db() as conn:
+        rows = conn.execute(sql + ' ORDER BY rank LIMIT ?', params + [limit]).fetchall()
+    return [dict(r) for r in rows]
+
+def negotiate_encoding():
+    return request.accept_encodings.best_match(['br', 'gzip'] if brotli else ['gzip'])
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+def compress_stream(chunks, encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        feed, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        feed, finish = compressor.compress, compressor.flush
+    for chunk in chunks:
+        data = feed(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield finish()
+
+def not_modified(etag, last_modified):
+    # Returns the validator to echo in a 304, or None if the caller's copy is
+    # stale. Compressed representations carry an -<encoding> suffix.
+    encoding = negotiate_encoding()
+    current = f'{etag}-{encoding}' if encoding else etag
+    if request.if_none_match:
+        for candidate in (current, etag):
+            if request.if_none_match.contains(candidate):
+                return candidate
+        return None
+    if request.if_modified_since and last_modified.replace(microsecond=0) <= request.if_modified_since:
+        return current
+    return None
+
+def with_validators(response, etag, last_modified):
+    if not response.get_etag()[0]:
+        response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+def stream_ndjson(items):
+    buf = []
+    for item in items:
+        buf.append(json.dumps(item) + '\n')
+        if len(buf) >= STREAM_CHUNK:
+            yield ''.join(buf)
+            buf = []
+    if buf:
+        yield ''.join(buf)
+
+class StaticAssets:
+    # Files under static/, fingerprinted by content at startup and served
+    # from /assets/<fingerprint>/<name> with a one-year immutable cache.
+    # Compressed bodies are built once per encoding.
+    def __init__(self, root):
+        self.root = root
+        self._files = {}
+        for dirpath, _, names in os.walk(root):
+            for filename in names:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, root).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    body = f.read()
+                content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                if content_type.startswith('text/') or content_type.endswith('javascript'):
+                    content_type += '; charset=utf-8'
+                self._files[name] = {'body': body, 'type': content_type, 'encoded': {},
+                                     'fingerprint': hashlib.sha256(body).hexdigest()[:12]}
+        self.version = hashlib.sha256(''.join(sorted(f['fingerprint'] for f in self._files.values())).encode()).hexdigest()[:12]
+
+    def has(self, name):
+        return name in self._files
+
+    def url(self, name):
+        return f"/assets/{self._files[name]['fingerprint']}/{name}"
+
+    def response(self, name, fingerprint):
+        asset = self._files.get(name)
+        if asset is None:
+            abort(404)
+        body = asset['body']
+        encoding = negotiate_encoding() if asset['type'].split(';')[0] in COMPRESSIBLE_TYPES else None
+        if encoding:
+            body = asset['encoded'].get(encoding)
+            if body is None:
+                body = asset['encoded'][encoding] = compress_body(asset['body'], encoding)
+        response = Response(body, content_type=asset['type'])
+        response.vary.add('Accept-Encoding')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.set_etag(f"{asset['fingerprint']}-{encoding}" if encoding else asset['fingerprint'])
+        if fingerprint == asset['fingerprint']:
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            # Link from a page rendered before a deploy: serve the current
+            # file, but let the browser revalidate it.
+            response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+assets = StaticAssets(STATIC_DIR)
+SOCKETIO_CLIENT_URL = assets.url(SOCKETIO_CLIENT) if assets.has(SOCKETIO_CLIENT) else SOCKETIO_CLIENT_CDN
+
+def stream_json_array(items):
+    yield '['
+    buf, first = [], True
+    for item in items:
+        buf.append(('' if first else ',') + json.dumps(item))
+        first = False
+        if len(buf) >= STREAM_CHUNK:
+            yield ''.join(buf)
+            buf = []
+    yield ''.join(buf) + ']'
+
+def board_room(board_id):
+    return f'board:{board_id}'
+
+class Broadcaster:
+    # Coalesces task events for BROADCAST_WINDOW_MS and fans them out as one
+    # tasks_delta frame per board and window, keeping only the latest state
+    # per task. Frames go to the board's room only.
+    def __init__(self, window_ms=BROADCAST_WINDOW_MS):
+        self.window = window_ms / 1000.0
+        self._pending = {}
+        self._flusher = None
+        self._counters = {'events_in': 0, 'frames_out': 0, 'tasks_out': 0, 'coalesced': 0}
+
+    def _board(self, board_id):
+        pending = self._pending.get(board_id)
+        if pending is None:
+            pending = self._pending[board_id] = {'upserts': {}, 'deleted': {}, 'revision': 0}
+        return pending
+
+    def upsert(self, task):
+        self._counters['events_in'] += 1
+        pending = self._board(task['board_id'])
+        queued = pending['upserts'].get(task['id'])
+        if queued is not None:
+            self._counters['coalesced'] += 1
+            if queued['revision'] > task['revision']:
+                return
+        pending['deleted'].pop(task['id'], None)
+        pending['upserts'][task['id']] = task
+        pending['revision'] = max(pending['revision'], task['revision'])
+        self._schedule()
+
+    def delete(self, task_id, revision, board_id=DEFAULT_BOARD):
+        self._counters['events_in'] += 1
+        pending = self._board(board_id)
+        if pending['upserts'].pop(task_id, None) is not None:
+            self._counters['coalesced'] += 1
+        pending['deleted'][task_id] = True
+        pending['revision'] = max(pending['revision'], revision or 0)
+        self._schedule()
+
+    def publish_batch(self, result):
+        for task in result['created'] + result['updated']:
+            self.upsert(task)
+        for task_id in result['deleted']:
+            self.delete(task_id, result['revision'], result['board_id'])
+
+    def publish_snapshot(self, board_id):
+        # One tasks_update with the whole board, for bulk changes where a
+        # delta would be as large; it supersedes anything pending.
+        self._pending.pop(board_id, None)
+        board = get_board(board_id)
+        board.sync()
+        self._counters['frames_out'] += 1
+        started = time.perf_counter()
+        tasks = board.tasks()
+        socketio.emit('tasks_update', {'revision': board.revision, 'tasks': tasks}, to=board_room(board_id))
+        broadcast_seconds.observe(time.perf_counter() - started)
+        broadcast_tasks.observe(len(tasks))
+
+    def _schedule(self):
+        if self.window <= 0:
+            self.flush()
+        elif self._flusher is None:
+            self._flusher = eventlet.spawn_after(self.window, self.flush)
+
+    def flush(self):
+        self._flusher = None
+        pending, self._pending = self._pending, {}
+        for board_id, changes in pending.items():
+            frame = {'revision': changes['revision'], 'full': False,
+                     'tasks': list(changes['upserts'].values()), 'deleted': list(changes['deleted'])}
+            # Frame size is tracked in tasks: measuring bytes would mean
+            # serializing every frame a second time on the hub.
+            size = len(frame['tasks']) + len(frame['deleted'])
+            self._counters['frames_out'] += 1
+            self._counters['tasks_out'] += size
+            started = time.perf_counter()
+            socketio.emit('tasks_delta', frame, to=board_room(board_id))
+            broadcast_seconds.observe(time.perf_counter() - started)
+            broadcast_tasks.observe(size)
+
+    def stats(self):
+        return dict(self._counters, window_ms=self.window * 1000,
+                    pending=sum(len(p['upserts']) + len(p['deleted']) for p in self._pending.values()))
+
+broadcaster = Broadcaster()
+
+class Archiver:
+    # Background job moving done tasks untouched for ARCHIVE_AFTER_DAYS into
+    # tasks_archive. Works in small writer ops so requests interleave.
+    def __init__(self, after_days=ARCHIVE_AFTER_DAYS, interval=ARCHIVE_INTERVAL_SECONDS, chunk=ARCHIVE_CHUNK):
+        self.after_days = after_days
+        self.interval = interval
+        self.chunk = chunk
+        self._job = None
+        self._counters = {'runs': 0, 'archived': 0, 'errors': 0, 'last_archived': 0,
+                          'last_run_at': None, 'last_duration_ms': None, 'max_chunk_ms': 0}
+
+    def start(self):
+        if self.after_days > 0 and self._job is None:
+            self._job = eventlet.spawn(self._loop)
+
+    def _loop(self):
+        while True:
+            eventlet.sleep(self.interval)
+            try:
+                self.run_once()
+            except Exception:
+                self._counters['errors'] += 1
+                app.logger.exception('archive run failed')
+
+    def run_once(self):
+        cutoff = (datetime.now() - timedelta(days=self.after_days)).isoformat()
+        started = time.perf_counter()
+        total = 0
+        while True:
+            chunk_started = time.perf_counter()
+            archived = writer.submit(_archive_tasks, cutoff, self.chunk)
+            self._counters['max_chunk_ms'] = max(self._counters['max_chunk_ms'], (time.perf_counter() - chunk_started) * 1000)
+            for task_id, revision, board_id in archived:
+                _write_through(board_id, deleted=[task_id], revision=revision)
+                broadcaster.delete(task_id, revision, board_id)
+            total += len(archived)
+            if len(archived) < self.chunk:
+                break
+            eventlet.sleep(0)
+        self._counters['runs'] += 1
+        self._counters['archived'] += total
+        self._counters['last_archived'] = total
+        self._counters['last_run_at'] = datetime.now().isoformat()
+        self._counters['last_duration_ms'] = (time.perf_counter() - started) * 1000
+        return total
+
+    def stats(self):
+        return dict(self._counters, after_days=self.after_days, interval_seconds=self.interval,
+                    chunk=self.chunk, running=self._job is not None)
+
+archiver = Archiver()
+archiver.start()
+
+def _backup_copy(path):
+    # Runs on a native thread. A single backup step copies the database in
+    # one WAL read transaction: a consistent snapshot that writers on other
+    # connections never wait for.
+    tmp = path + '.tmp'
+    source = sqlite3.connect(DB_PATH)
+    target = sqlite3.connect(tmp)
+    try:
+        source.backup(target, pages=-1)
+    finally:
+        target.close()
+        source.close()
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+class BackupJob:
+    # Periodic online snapshots into BACKUP_DIR, keeping the newest
+    # BACKUP_KEEP. A lock file keeps workers from snapshotting at the same
+    # time; a scheduled run is skipped if another worker just took one.
+    def __init__(self, directory=BACKUP_DIR, interval=BACKUP_INTERVAL_SECONDS, keep=BACKUP_KEEP):
+        self.directory = directory
+        self.interval = interval
+        self.keep = keep
+        self._job = None
+        self._running = Semaphore()
+        self._counters = {'runs': 0, 'errors': 0, 'skipped': 0, 'last_file': None, 'last_bytes': None,
+                          'last_run_at': None, 'last_duration_ms': None}
+
+    def start(self):
+        if self.interval > 0 and self._job is None:
+            self._job = eventlet.spawn(self._loop)
+
+    def _loop(self):
+        while True:
+            eventlet.sleep(self.interval)
+            try:
+                self.run_once(scheduled=True)
+            except Exception:
+                self._counters['errors'] += 1
+                app.logger.exception('backup failed')
+
+    def files(self):
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted((n for n in os.listdir(self.directory) if n.startswith('kanban-') and n.endswith('.db')), reverse=True)
+        return [{'name': n, 'bytes': os.path.getsize(os.path.join(self.directory, n))} for n in names]
+
+    def run_once(self, scheduled=False):
+        # None when a backup is already running, here or in another worker.
+        if not self._running.acquire(blocking=False):
+            self._counters['skipped'] += 1
+            return None
+        try:
+            return self._snapshot(scheduled)
+        finally:
+            self._running.release()
+
+    def _snapshot(self, scheduled):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, '.lock'), 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._counters['skipped'] += 1
+                return None
+            latest = self.files()
+            if scheduled and latest and time.time() - os.path.getmtime(os.path.join(self.directory, latest[0]['name'])) < self.interval / 2:
+                # Another worker already took this interval's snapshot.
+                self._counters['skipped'] += 1
+                return None
+            started = time.perf_counter()
+            name = f'kanban-{datetime.now():%Y%m%d-%H%M%S-%f}.db'
+            size = tpool.execute(_backup_copy, os.path.join(self.directory, name))
+            for old in self.files()[self.keep:]:
+                os.remove(os.path.join(self.directory, old['name']))
+        self._counters['runs'] += 1
+        self._counters['last_file'] = name
+        self._counters['last_bytes'] = size
+        self._counters['last_run_at'] = datetime.now().isoformat()
+        self._counters['last_duration_ms'] = (time.perf_counter() - started) * 1000
+        return {'name': name, 'bytes': size}
+
+    def stats(self):
+        return dict(self._counters, directory=self.directory, interval_seconds=self.interval,
+                    keep=self.keep, running=self._job is not None)
+
+backups = BackupJob()
+backups.start()
+
+def get_archived_tasks(after=None, limit=100, board_id=DEFAULT_BOARD):
+    sql = 'SELECT * FROM tasks_archive WHERE board_id = ?'
+    params = [board_id]
+    if after:
+        sql += ' AND (archived_at, id) < (?, ?)'
+        params.extend(after)
+    with get_db() as conn:
+        rows = conn.execute(sql + ' ORDER BY archived_at DESC, id DESC LIMIT ?', params + [limit + 1]).fetchall()
+    tasks = [dict(r) for r in rows[:limit]]
+    cursor = encode_cursor(tasks[-1]['archived_at'], tasks[-1]['id']) if len(rows) > limit else None
+    return tasks, cursor
 
 LOGIN_TEMPLATE = '''
 <!DOCTYPE html>
@@ -186,75 +1613,9 @@ TEMPLATE = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>🧠 Garion Kanban</title>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.5.4/socket.io.min.js"></script>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: 'Segoe UI', system-ui, sans-serif;
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            min-height: 100vh;
-            color: #e8e8e8;
-            padding: 1rem;
-        }
-        header {
-            text-align: center;
-            padding: 1rem;
-            margin-bottom: 1rem;
-        }
-        .header-row { display: flex; justify-content: space-between; align-items: center; max-width: 1400px; margin: 0 auto; }
-        h1 { font-size: 2rem; margin-bottom: 0.5rem; }
-        h1 span { color: #00d9ff; }
-        .logout-btn { background: rgba(255,255,255,0.1); border: none; color: #888; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer; }
-        .logout-btn:hover { background: rgba(255,255,255,0.2); color: #fff; }
-        .status-bar { display: flex; justify-content: center; gap: 1rem; margin-bottom: 1rem; font-size: 0.85rem; }
-        .status-item { display: flex; align-items: center; gap: 0.5rem; }
-        .status-dot { width: 10px; height: 10px; border-radius: 50%; }
-        .status-dot.connected { background: #00ff88; }
-        .status-dot.disconnected { background: #ff4444; }
-        .board { display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; max-width: 1400px; margin: 0 auto; }
-        .column { background: rgba(255,255,255,0.05); border-radius: 12px; padding: 1rem; min-height: 70vh; }
-        .column-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem; padding-bottom: 0.75rem; border-bottom: 2px solid rgba(255,255,255,0.1); }
-        .column-title { font-weight: 600; font-size: 1.1rem; display: flex; align-items: center; gap: 0.5rem; }
-        .column-count { background: rgba(255,255,255,0.1); padding: 0.25rem 0.75rem; border-radius: 12px; font-size: 0.85rem; }
-        .column.todo .column-title { color: #ff6b6b; }
-        .column.doing .column-title { color: #ffd93d; }
-        .column.done .column-title { color: #6bcb77; }
-        .tasks { min-height: 200px; }
-        .task { background: rgba(0,0,0,0.3); border-radius: 8px; padding: 1rem; margin-bottom: 0.75rem; cursor: grab; transition: all 0.2s; border-left: 4px solid #666; }
-        .task:hover { transform: translateX(4px); background: rgba(0,0,0,0.4); }
-        .task.dragging { opacity: 0.5; cursor: grabbing; }
-        .task.priority-high { border-left-color: #ff6b6b; }
-        .task.priority-medium { border-left-color: #ffd93d; }
-        .task.priority-low { border-left-color: #6bcb77; }
-        .task-title { font-weight: 500; margin-bottom: 0.5rem; }
-        .task-desc { font-size: 0.85rem; color: #888; margin-bottom: 0.5rem; }
-        .task-meta { display: flex; justify-content: space-between; align-items: center; font-size: 0.75rem; color: #666; }
-        .task-source { background: rgba(0,217,255,0.2); color: #00d9ff; padding: 0.15rem 0.5rem; border-radius: 4px; }
-        .task-actions { display: flex; gap: 0.5rem; opacity: 0; transition: opacity 0.2s; }
-        .task:hover .task-actions { opacity: 1; }
-        .task-btn { background: none; border: none; cursor: pointer; font-size: 0.9rem; padding: 0.25rem; }
-        .add-task-btn { width: 100%; padding: 0.75rem; background: rgba(255,255,255,0.05); border: 2px dashed rgba(255,255,255,0.2); border-radius: 8px; color: #888; cursor: pointer; transition: all 0.2s; font-size: 0.9rem; }
-        .add-task-btn:hover { border-color: #00d9ff; color: #00d9ff; background: rgba(0,217,255,0.1); }
-        .modal { display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%; background: rgba(0,0,0,0.8); justify-content: center; align-items: center; z-index: 1000; }
-        .modal.active { display: flex; }
-        .modal-content { background: #1a1a2e; padding: 2rem; border-radius: 16px; width: 90%; max-width: 500px; border: 1px solid rgba(255,255,255,0.1); }
-        .modal h2 { margin-bottom: 1.5rem; color: #00d9ff; }
-        .form-group { margin-bottom: 1rem; }
-        .form-group label { display: block; margin-bottom: 0.5rem; font-size: 0.9rem; color: #888; }
-        .form-group input, .form-group textarea, .form-group select { width: 100%; padding: 0.75rem; border: 1px solid rgba(255,255,255,0.2); border-radius: 8px; background: rgba(0,0,0,0.3); color: #fff; font-size: 1rem; }
-        .form-group textarea { min-height: 80px; resize: vertical; }
-        .form-actions { display: flex; gap: 1rem; margin-top: 1.5rem; }
-        .btn { flex: 1; padding: 0.75rem; border: none; border-radius: 8px; cursor: pointer; font-size: 1rem; transition: all 0.2s; }
-        .btn-primary { background: #00d9ff; color: #000; }
-        .btn-primary:hover { background: #00b8d9; }
-        .btn-secondary { background: rgba(255,255,255,0.1); color: #fff; }
-        .btn-secondary:hover { background: rgba(255,255,255,0.2); }
-        .drop-zone { background: rgba(0,217,255,0.1); border: 2px dashed #00d9ff; }
-        .toast { position: fixed; bottom: 2rem; right: 2rem; background: #00d9ff; color: #000; padding: 1rem 1.5rem; border-radius: 8px; font-weight: 500; transform: translateY(100px); opacity: 0; transition: all 0.3s; }
-        .toast.show { transform: translateY(0); opacity: 1; }
-        .user-info { color: #888; font-size: 0.85rem; }
-        @media (max-width: 900px) { .board { grid-template-columns: 1fr; } .column { min-height: auto; } }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('board.css') }}">
+    <script src="{{ socketio_client_url }}" defer></script>
+    <script src="{{ asset_url('board.js') }}" defer></script>
 </head>
 <body>
     <header>
@@ -277,6 +1638,14 @@ TEMPLATE = '''
                 <span>📊</span>
                 <span id="taskCount">0 tasks</span>
             </div>
+            <div class="status-item">
+                <span>🗂️</span>
+                <span>{{ board_id }}</span>
+            </div>
+        </div>
+        <div class="search">
+            <input type="search" id="searchInput" placeholder="🔍 Buscar tasks..." autocomplete="off">
+            <div class="search-results" id="searchResults"></div>
         </div>
     </header>
     <div class="board">
@@ -286,6 +1655,7 @@ TEMPLATE = '''
                 <span class="column-count" id="count-todo">0</span>
             </div>
             <div class="tasks" id="tasks-todo"></div>
+            <button class="show-more" id="more-todo" hidden></button>
             <button class="add-task-btn" onclick="openModal('todo')">+ Nova Task</button>
         </div>
         <div class="column doing" data-status="doing">
@@ -294,6 +1664,7 @@ TEMPLATE = '''
                 <span class="column-count" id="count-doing">0</span>
             </div>
             <div class="tasks" id="tasks-doing"></div>
+            <button class="show-more" id="more-doing" hidden></button>
             <button class="add-task-btn" onclick="openModal('doing')">+ Nova Task</button>
         </div>
         <div class="column done" data-status="done">
@@ -302,6 +1673,7 @@ TEMPLATE = '''
                 <span class="column-count" id="count-done">0</span>
             </div>
             <div class="tasks" id="tasks-done"></div>
+            <button class="show-more" id="more-done" hidden></button>
             <button class="add-task-btn" onclick="openModal('done')">+ Nova Task</button>
         </div>
     </div>
@@ -335,58 +1707,17 @@ TEMPLATE = '''
         </div>
     </div>
     <div class="toast" id="toast"></div>
-    <script>
-        const socket = io();
-        let tasks = [];
-        socket.on('connect', () => {
-            document.getElementById('connectionStatus').classList.add('connected');
-            document.getElementById('connectionStatus').classList.remove('disconnected');
-            document.getElementById('connectionText').textContent = 'Live 🟢';
-            socket.emit('get_tasks');
-        });
-        socket.on('disconnect', () => {
-            document.getElementById('connectionStatus').classList.remove('connected');
-            document.getElementById('connectionStatus').classList.add('disconnected');
-            document.getElementById('connectionText').textContent = 'Desconectado';
-        });
-        socket.on('tasks_update', (data) => { tasks = data; renderTasks(); });
-        socket.on('task_created', (task) => { tasks.push(task); renderTasks(); showToast('Task "' + task.title + '" criada!'); });
-        socket.on('task_updated', (task) => { const idx = tasks.findIndex(t => t.id === task.id); if (idx !== -1) tasks[idx] = task; renderTasks(); });
-        socket.on('task_deleted', (taskId) => { tasks = tasks.filter(t => t.id !== taskId); renderTasks(); showToast('Task removida'); });
-        function renderTasks() {
-            ['todo', 'doing', 'done'].forEach(status => {
-                const container = document.getElementById('tasks-' + status);
-                const filtered = tasks.filter(t => t.status === status);
-                document.getElementById('count-' + status).textContent = filtered.length;
-                container.innerHTML = filtered.map(task => '<div class="task priority-' + task.priority + '" draggable="true" data-id="' + task.id + '"><div class="task-title">' + escapeHtml(task.title) + '</div>' + (task.description ? '<div class="task-desc">' + escapeHtml(task.description) + '</div>' : '') + '<div class="task-meta"><span class="task-source">' + (task.source === 'clawdbot' ? '🧠 Garion' : '🖥️ App') + '</span><div class="task-actions"><button class="task-btn" onclick="editTask(\'' + task.id + '\')">✏️</button><button class="task-btn" onclick="deleteTask(\'' + task.id + '\')">🗑️</button></div></div></div>').join('');
-            });
-            document.getElementById('taskCount').textContent = tasks.length + ' tasks';
-            setupDragDrop();
-        }
-        function escapeHtml(text) { const div = document.createElement('div'); div.textContent = text; return div.innerHTML; }
-        function setupDragDrop() {
-            document.querySelectorAll('.task').forEach(task => {
-                task.addEventListener('dragstart', (e) => { e.target.classList.add('dragging'); e.dataTransfer.setData('text/plain', e.target.dataset.id); });
-                task.addEventListener('dragend', (e) => { e.target.classList.remove('dragging'); document.querySelectorAll('.tasks').forEach(c => c.classList.remove('drop-zone')); });
-            });
-            document.querySelectorAll('.tasks').forEach(container => {
-                container.addEventListener('dragover', (e) => { e.preventDefault(); container.classList.add('drop-zone'); });
-                container.addEventListener('dragleave', () => { container.classList.remove('drop-zone'); });
-                container.addEventListener('drop', (e) => { e.preventDefault(); container.classList.remove('drop-zone'); const taskId = e.dataTransfer.getData('text/plain'); const newStatus = container.parentElement.dataset.status; socket.emit('update_task', { id: taskId, status: newStatus }); });
-            });
-        }
-        function openModal(status = 'todo') { document.getElementById('taskModal').classList.add('active'); document.getElementById('modalTitle').textContent = 'Nova Task'; document.getElementById('taskId').value = ''; document.getElementById('taskStatus').value = status; document.getElementById('taskTitle').value = ''; document.getElementById('taskDesc').value = ''; document.getElementById('taskPriority').value = 'medium'; document.getElementById('taskTitle').focus(); }
-        function closeModal() { document.getElementById('taskModal').classList.remove('active'); }
-        function editTask(id) { const task = tasks.find(t => t.id === id); if (!task) return; document.getElementById('taskModal').classList.add('active'); document.getElementById('modalTitle').textContent = 'Editar Task'; document.getElementById('taskId').value = task.id; document.getElementById('taskStatus').value = task.status; document.getElementById('taskTitle').value = task.title; document.getElementById('taskDesc').value = task.description || ''; document.getElementById('taskPriority').value = task.priority; }
-        function deleteTask(id) { if (confirm('Remover esta task?')) { socket.emit('delete_task', { id }); } }
-        document.getElementById('taskForm').addEventListener('submit', (e) => { e.preventDefault(); const id = document.getElementById('taskId').value; const data = { title: document.getElementById('taskTitle').value, description: document.getElementById('taskDesc').value, status: document.getElementById('taskStatus').value, priority: document.getElementById('taskPriority').value }; if (id) { socket.emit('update_task', { id, ...data }); } else { socket.emit('create_task', data); } closeModal(); });
-        function showToast(message) { const toast = document.getElementById('toast'); toast.textContent = message; toast.classList.add('show'); setTimeout(() => toast.classList.remove('show'), 3000); }
-        document.addEventListener('keydown', (e) => { if (e.key === 'Escape') closeModal(); });
-    </script>
+    <template id="cardTemplate"><div class="task" draggable="true"><div class="task-title"></div><div class="task-desc"></div><div class="task-meta"><span class="task-source"></span><div class="task-actions"><button class="task-btn" data-action="edit">✏️</button><button class="task-btn" data-action="delete">🗑️</button></div></div></div></template>
+    <script id="boardState" type="application/json">{{ state }}</script>
 </body>
 </html>
 '''
 
+# Parsed once; render_template() accepts the compiled templates directly.
+app.jinja_env.globals['asset_url'] = assets.url
+LOGIN_PAGE = app.jinja_env.from_string(LOGIN_TEMPLATE)
+BOARD_PAGE = app.jinja_env.from_string(TEMPLATE)
+
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     error = None
@@ -397,77 +1728,401 @@ def login():
             return redirect(url_for('index'))
         else:
             error = 'Usuário ou senha inválidos'
-    return render_template_string(LOGIN_TEMPLATE, error=error)
+    return render_template(LOGIN_PAGE, error=error)
 
 @app.route('/logout')
 def logout():
     session.clear()
     return redirect(url_for('login'))
 
-@app.route('/')
+@app.route('/', defaults={'board_id': DEFAULT_BOARD})
+@app.route('/boards/<board:board_id>')
 @login_required
-def index():
-    return render_template_string(TEMPLATE, user=session.get('user', 'Guest'))
+def index(board_id):
+    # The page embeds the board snapshot, so it is only as fresh as the
+    # board revision and the assets it links to.
+    user = session.get('user', 'Guest')
+    board = get_board(board_id)
+    board.sync()
+    etag = f'p{board.revision}.{assets.version}.' + hashlib.sha1(user.encode()).hexdigest()[:8]
+    last_modified = board.last_modified()
+    matched = not_modified(etag, last_modified)
+    if matched:
+        return with_validators(Response(status=304), matched, last_modified)
+    state = Markup('{"board_id": %s, "transports": %s, "revision": %d, "tasks": %s}' % (
+        json.dumps(board_id), json.dumps(SOCKETIO_TRANSPORTS), board.revision, board.snapshot_html()))
+    html = render_template(BOARD_PAGE, user=user, board_id=board_id, state=state, socketio_client_url=SOCKETIO_CLIENT_URL)
+    return with_validators(Response(html, mimetype='text/html'), etag, last_modified)
+
+@app.route('/assets/<fingerprint>/<path:filename>')
+def static_asset(fingerprint, filename):
+    return assets.response(filename, fingerprint)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+# Registered before compress_response so it runs after it and includes the
+# compression time.
+@app.after_request
+def observe_request(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        http_seconds.observe(time.perf_counter() - started, request.method, route, str(response.status_code))
+    return response
+
+@app.after_request
+def compress_response(response):
+    if response.mimetype not in COMPRESSIBLE_TYPES or response.status_code != 200:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None or 'Content-Encoding' in response.headers:
+        return response
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress_body(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+    return response
 
 # REST API for Clawdbot integration (with API key auth)
-@app.route('/api/tasks', methods=['GET'])
+@app.route('/api/boards', methods=['GET'])
+@api_auth_required
+def api_boards():
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT board_id, SUM(count) AS tasks FROM board_counters WHERE dimension = 'status' "
+            "GROUP BY board_id HAVING tasks != 0 ORDER BY board_id"
+        ).fetchall()
+    return jsonify([dict(r) for r in rows])
+
+@app.route('/api/tasks', methods=['GET'], defaults={'board_id': DEFAULT_BOARD})
+@app.route('/api/boards/<board:board_id>/tasks', methods=['GET'])
+@api_auth_required
+def api_get_tasks(board_id):
+    args = request.args
+    board = get_board(board_id)
+    board.sync()
+    etag = f'r{board.revision}'
+    if args:
+        etag += '.' + hashlib.sha1(request.query_string).hexdigest()[:12]
+    last_modified = board.last_modified()
+    matched = not_modified(etag, last_modified)
+    if matched:
+        return with_validators(Response(status=304), matched, last_modified)
+    if not args:
+        encoding = negotiate_encoding()
+        response = Response(board.snapshot_encoded(encoding), mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f'{etag}-{encoding}')
+        return with_validators(response, etag, last_modified)
+    if list(args) == ['status'] and ',' not in args['status']:
+        return with_validators(jsonify(board.tasks(args['status'])), etag, last_modified)
+    filters = {k: [v for v in args.get(k, '').split(',') if v] for k in ('status', 'priority', 'source')}
+    filters['board_id'] = board_id
+    filters['updated_since'] = args.get('updated_since')
+    fields = [f for f in args.get('fields', '').split(',') if f] or None
+    try:
+        if filters['updated_since']:
+            datetime.fromisoformat(filters['updated_since'])
+        if fields and not set(fields) <= set(TASK_COLUMNS):
+            raise ValueError('Unknown field')
+        after = decode_cursor(args['cursor']) if args.get('cursor') else None
+        limit = min(int(args['limit']), API_PAGE_MAX) if args.get('limit') else None
+        if limit is not None and limit < 1:
+            raise ValueError('Invalid limit')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if limit is None:
+        return with_validators(Response(stream_json_array(iter_tasks(filters, fields, after)), mimetype='application/json'),
+                               etag, last_modified)
+    tasks, cursor = fetch_task_page(filters, fields, after, limit)
+    response = Response(stream_json_array(tasks), mimetype='application/json')
+    if cursor:
+        response.headers['X-Next-Cursor'] = cursor
+        response.headers['Link'] = f'<{url_for("api_get_tasks", board_id=board_id, **dict(args, cursor=cursor))}>; rel="next"'
+    return with_validators(response, etag, last_modified)
+
+@app.route('/api/tasks/search', methods=['GET'], defaults={'board_id': DEFAULT_BOARD})
+@app.route('/api/boards/<board:board_id>/tasks/search', methods=['GET'])
+@api_auth_required
+def api_search_tasks(board_id):
+    status = [v for v in request.args.get('status', '').split(',') if v]
+    try:
+        limit = int(request.args.get('limit', 20))
+        return jsonify(search_tasks(request.args.get('q'), status, limit, board_id))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/tasks/changes', methods=['GET'], defaults={'board_id': DEFAULT_BOARD})
+@app.route('/api/boards/<board:board_id>/tasks/changes', methods=['GET'])
 @api_auth_required
-def api_get_tasks():
-    return jsonify(get_all_tasks())
+def api_get_changes(board_id):
+    try:
+        since = int(request.args['since']) if request.args.get('since') else None
+    except ValueError:
+        return jsonify({'error': 'since must be an integer revision'}), 400
+    board = get_board(board_id)
+    board.sync()
+    etag = f'r{board.revision}.s{since}'
+    last_modified = board.last_modified()
+    matched = not_modified(etag, last_modified)
+    if matched:
+        return with_validators(Response(status=304), matched, last_modified)
+    return with_validators(jsonify(get_changes_since(since, board_id)), etag, last_modified)
 
-@app.route('/api/tasks', methods=['POST'])
+@app.route('/api/tasks', methods=['POST'], defaults={'board_id': DEFAULT_BOARD})
+@app.route('/api/boards/<board:board_id>/tasks', methods=['POST'])
 @api_auth_required
-def api_create_task():
+def api_create_task(board_id):
     data = request.json
     task = create_task(
         title=data.get('title'),
         description=data.get('description', ''),
         status=data.get('status', 'todo'),
         priority=data.get('priority', 'medium'),
-        source=data.get('source', 'clawdbot')
+        source=data.get('source', 'clawdbot'),
+        board_id=board_id
     )
-    socketio.emit('task_created', task)
+    broadcaster.upsert(task)
     return jsonify(task), 201
 
-@app.route('/api/tasks/<task_id>', methods=['PATCH'])
+@app.route('/api/tasks/<task_id>', methods=['PATCH'], defaults={'board_id': DEFAULT_BOARD})
+@app.route('/api/boards/<board:board_id>/tasks/<task_id>', methods=['PATCH'])
 @api_auth_required
-def api_update_task(task_id):
+def api_update_task(board_id, task_id):
     data = request.json
-    task = update_task(task_id, **data)
+    task = update_task(task_id, data, board_id)
     if task:
-        socketio.emit('task_updated', task)
+        broadcaster.upsert(task)
         return jsonify(task)
     return jsonify({'error': 'Task not found'}), 404
 
-@app.route('/api/tasks/<task_id>', methods=['DELETE'])
+@app.route('/api/tasks/<task_id>', methods=['DELETE'], defaults={'board_id': DEFAULT_BOARD})
+@app.route('/api/boards/<board:board_id>/tasks/<task_id>', methods=['DELETE'])
 @api_auth_required
-def api_delete_task(task_id):
-    delete_task(task_id)
-    socketio.emit('task_deleted', task_id)
+def api_delete_task(board_id, task_id):
+    revision = delete_task(task_id, board_id)
+    if revision:
+        broadcaster.delete(task_id, revision, board_id)
     return '', 204
 
+@app.route('/api/tasks/batch', methods=['POST'], defaults={'board_id': DEFAULT_BOARD})
+@app.route('/api/boards/<board:board_id>/tasks/batch', methods=['POST'])
+@api_auth_required
+def api_batch_tasks(board_id):
+    data = request.json or {}
+    try:
+        result = apply_batch(data.get('operations'), source=data.get('source', 'clawdbot'), board_id=board_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': e.args[0]}), 404
+    broadcaster.publish_batch(result)
+    return jsonify(result)
+
+@app.route('/api/tasks/archive', methods=['GET'], defaults={'board_id': DEFAULT_BOARD})
+@app.route('/api/boards/<board:board_id>/tasks/archive', methods=['GET'])
+@api_auth_required
+def api_archived_tasks(board_id):
+    try:
+        after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        limit = min(int(request.args.get('limit', 100)), API_PAGE_MAX)
+        if limit < 1:
+            raise ValueError('Invalid limit')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    tasks, cursor = get_archived_tasks(after, limit, board_id)
+    response = jsonify(tasks)
+    if cursor:
+        response.headers['X-Next-Cursor'] = cursor
+        response.headers['Link'] = f'<{url_for("api_archived_tasks", board_id=board_id, **dict(request.args, cursor=cursor))}>; rel="next"'
+    return response
+
+@app.route('/api/export', methods=['GET'])
+@api_auth_required
+def api_export():
+    board_id = request.args.get('board_id')
+    if board_id is not None and not re.fullmatch(BOARD_ID_PATTERN, board_id):
+        return jsonify({'error': 'Invalid board_id'}), 400
+    include_archived = request.args.get('include_archived', '1') != '0'
+    response = Response(stream_ndjson(export_tasks(board_id, include_archived)), mimetype='application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename="kanban-{board_id or "all"}.ndjson"'
+    return response
+
+@app.route('/api/import', methods=['POST'])
+@api_auth_required
+def api_import():
+    result = import_tasks(request.stream)
+    for board_id in result['boards']:
+        broadcaster.publish_snapshot(board_id)
+    return jsonify(result), 400 if 'error' in result else 200
+
+@app.route('/api/backups', methods=['GET'])
+@api_auth_required
+def api_backups():
+    return jsonify(dict(backups.stats(), backups=backups.files()))
+
+@app.route('/api/backups', methods=['POST'])
+@api_auth_required
+def api_create_backup():
+    backup = backups.run_once()
+    if backup is None:
+        return jsonify({'error': 'A backup is already running'}), 409
+    return jsonify(backup), 201
+
+@app.route('/api/archiver', methods=['GET'])
+@api_auth_required
+def api_archiver():
+    return jsonify(archiver.stats())
+
+@app.route('/api/stats', methods=['GET'], defaults={'board_id': DEFAULT_BOARD})
+@app.route('/api/boards/<board:board_id>/stats', methods=['GET'])
+@api_auth_required
+def api_stats(board_id):
+    board = get_board(board_id)
+    board.sync()
+    return jsonify(board_stats.get(board_id, board.revision))
+
+@app.route('/api/broadcast', methods=['GET'])
+@api_auth_required
+def api_broadcast():
+    return jsonify(broadcaster.stats())
+
+@app.route('/api/cache', methods=['GET'])
+@api_auth_required
+def api_cache():
+    return jsonify({board_id: cache.stats() for board_id, cache in board_caches.items()})
+
+@app.route('/api/db/pool', methods=['GET'])
+@api_auth_required
+def api_db_pool():
+    return jsonify(db_pool.stats())
+
+@app.route('/api/db/writer', methods=['GET'])
+@api_auth_required
+def api_db_writer():
+    return jsonify(writer.stats())
+
+@app.route('/metrics', methods=['GET'])
+@api_auth_required
+def metrics_endpoint():
+    return Response(registry.render(), content_type=METRICS_CONTENT_TYPE)
+
 # WebSocket events
-@socketio.on('get_tasks')
-def handle_get_tasks():
-    emit('tasks_update', get_all_tasks())
+socket_boards = {}
+
+def _socket_counts():
+    counts = {}
+    for board_id in socket_boards.values():
+        counts[board_id] = counts.get(board_id, 0) + 1
+    return counts
+
+registry.gauge('kanban_socket_connections', 'Connected Socket.IO clients by board', _socket_counts, ('board',))
+
+def socket_event(event):
+    # @socketio.on with per-event latency and error metrics.
+    def decorator(f):
+        @wraps(f)
+        def handler(*args):
+            started = time.perf_counter()
+            try:
+                return f(*args)
+            except Exception:
+                socket_errors.inc(event)
+                raise
+            finally:
+                socket_seconds.observe(time.perf_counter() - started, event)
+        socketio.on(event)(handler)
+        return f
+    return decorator
+
+def _socket_board():
+    return socket_boards.get(request.sid, DEFAULT_BOARD)
 
-@socketio.on('create_task')
+def _join_board(board_id):
+    previous = socket_boards.get(request.sid)
+    if previous is not None and previous != board_id:
+        leave_room(board_room(previous))
+    join_room(board_room(board_id))
+    socket_boards[request.sid] = board_id
+
+@socket_event('connect')
+def handle_connect(auth=None):
+    board_id = request.args.get('board', DEFAULT_BOARD)
+    if not re.fullmatch(BOARD_ID_PATTERN, board_id):
+        return False
+    _join_board(board_id)
+
+@socket_event('disconnect')
+def handle_disconnect():
+    socket_boards.pop(request.sid, None)
+
+@socket_event('join_board')
+def handle_join_board(data):
+    board_id = (data or {}).get('board_id')
+    if not isinstance(board_id, str) or not re.fullmatch(BOARD_ID_PATTERN, board_id):
+        return {'error': 'Invalid board_id'}
+    _join_board(board_id)
+    handle_get_tasks()
+    return {'ok': True}
+
+@socket_event('get_tasks')
+def handle_get_tasks(data=None):
+    board_id = _socket_board()
+    since = (data or {}).get('since')
+    changes = get_changes_since(since, board_id) if isinstance(since, int) else None
+    if changes is None or changes['full']:
+        board = get_board(board_id)
+        board.sync()
+        emit('tasks_update', {'revision': board.revision, 'tasks': board.tasks()})
+    else:
+        emit('tasks_delta', changes)
+
+@socket_event('search_tasks')
+def handle_search_tasks(data):
+    try:
+        return {'results': search_tasks((data or {}).get('q'), limit=(data or {}).get('limit', 20), board_id=_socket_board())}
+    except (ValueError, TypeError) as e:
+        return {'error': str(e), 'results': []}
+
+@socket_event('create_task')
 def handle_create_task(data):
-    task = create_task(title=data.get('title'), description=data.get('description', ''), status=data.get('status', 'todo'), priority=data.get('priority', 'medium'), source='app')
-    emit('task_created', task, broadcast=True)
+    task = create_task(title=data.get('title'), description=data.get('description', ''), status=data.get('status', 'todo'), priority=data.get('priority', 'medium'), source='app', board_id=_socket_board())
+    broadcaster.upsert(task)
 
-@socketio.on('update_task')
+@socket_event('update_task')
 def handle_update_task(data):
     task_id = data.pop('id')
-    task = update_task(task_id, **data)
+    task = update_task(task_id, data, _socket_board())
     if task:
-        emit('task_updated', task, broadcast=True)
+        broadcaster.upsert(task)
 
-@socketio.on('delete_task')
+@socket_event('delete_task')
 def handle_delete_task(data):
     task_id = data.get('id')
-    delete_task(task_id)
-    emit('task_deleted', task_id, broadcast=True)
+    board_id = _socket_board()
+    revision = delete_task(task_id, board_id)
+    if revision:
+        broadcaster.delete(task_id, revision, board_id)
+
+@socket_event('batch_tasks')
+def handle_batch_tasks(data):
+    try:
+        result = apply_batch(data.get('operations'), source='app', board_id=_socket_board())
+    except (ValueError, LookupError) as e:
+        return {'error': e.args[0]}
+    broadcaster.publish_batch(result)
+    return {'ok': True}
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
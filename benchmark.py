@@ -0,0 +1,326 @@
+"""Load test for the REST and Socket.IO paths.
+
+Boots the app with gunicorn against a throwaway DB_PATH (or targets --url),
+seeds the boards, then runs concurrent REST writers and readers while N
+Socket.IO clients listen for tasks_delta frames. Reports throughput and
+p50/p95/p99 latency per REST call and for mutation-to-broadcast delivery,
+and saves everything as JSON so runs can be compared across commits.
+
+    pip install -r requirements-bench.txt
+    python benchmark.py --boards 4 --tasks 2000 --writers 8 --clients 50
+    python benchmark.py --compare bench-results/old.json bench-results/new.json
+
+Broadcast latency is measured from the task's updated_at to the moment a
+client receives it, so the app and the clients must share a clock (run on
+the same host). Clients connect after the seed frames have drained and only
+count tasks the writers touched.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import requests
+import socketio
+
+API_KEY = os.environ.get('KANBAN_API_KEY', 'garion-api-key-2026')
+SEED_CHUNK = 500
+WRITER_TITLE = 'Bench '
+STATUSES = ('todo', 'doing', 'done')
+PRIORITIES = ('low', 'medium', 'high')
+
+
+def percentiles(values):
+    if not values:
+        return {'count': 0, 'p50': None, 'p95': None, 'p99': None, 'max': None, 'mean': None}
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {'count': len(values), 'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99),
+            'max': values[-1], 'mean': sum(values) / len(values)}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Server:
+    # gunicorn with the repo's config on a free port and a temporary database.
+    def __init__(self, workers):
+        self.workers = workers
+        self.port = _free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        self._tmp = tempfile.mkdtemp(prefix='kanban-bench-')
+        self._proc = None
+
+    def __enter__(self):
+        env = dict(os.environ, DB_PATH=os.path.join(self._tmp, 'kanban.db'), PORT=str(self.port),
+                   KANBAN_WORKERS=str(self.workers), KANBAN_MQ_SOCKET=os.path.join(self._tmp, 'mq.sock'),
+                   ARCHIVE_AFTER_DAYS='0')
+        env.pop('SOCKETIO_MESSAGE_QUEUE', None)
+        self._log = open(os.path.join(self._tmp, 'server.log'), 'w')
+        self._proc = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+            cwd=os.path.dirname(os.path.abspath(__file__)), env=env, stdout=self._log, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if self._proc.poll() is not None:
+                raise RuntimeError(f'server exited, see {self._log.name}')
+            try:
+                if requests.get(self.url + '/api/boards', headers={'X-API-Key': API_KEY}, timeout=1).ok:
+                    # Every worker has to be up before clients spread over them.
+                    time.sleep(0.5 * self.workers)
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError('server did not start within 30s')
+
+    def __exit__(self, *exc):
+        self._proc.terminate()
+        try:
+            self._proc.wait(10)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+        self._log.close()
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}
+        self.errors = {}
+
+    def add(self, kind, seconds):
+        with self._lock:
+            self.latency.setdefault(kind, []).append(seconds)
+
+    def error(self, kind):
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+def _session():
+    session = requests.Session()
+    session.headers['X-API-Key'] = API_KEY
+    return session
+
+
+def seed(url, boards, tasks_per_board, rng):
+    session = _session()
+    ids = {}
+    for board in boards:
+        ids[board] = []
+        for start in range(0, tasks_per_board, SEED_CHUNK):
+            ops = [{'op': 'create', 'title': f'Seed task {start + i}', 'description': 'benchmark seed ' * 4,
+                    'status': rng.choice(STATUSES), 'priority': rng.choice(PRIORITIES)}
+                   for i in range(min(SEED_CHUNK, tasks_per_board - start))]
+            response = session.post(f'{url}/api/boards/{board}/tasks/batch', json={'operations': ops})
+            response.raise_for_status()
+            ids[board].extend(t['id'] for t in response.json()['created'])
+    return ids
+
+
+def wait_for_broadcasts(url, timeout=30):
+    # Clients connect only once the seed frames have gone out, so none of
+    # them is counted as a broadcast sample.
+    session = _session()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = session.get(f'{url}/api/broadcast').json()
+        if stats['pending'] == 0:
+            time.sleep(stats['window_ms'] / 1000)
+            return
+        time.sleep(0.05)
+    raise RuntimeError(f'seed broadcasts still pending after {timeout}s')
+
+
+def writer(url, boards, ids, touched, ops, rng, recorder):
+    # Alternates creates and status/priority updates on random boards. Ids
+    # are added to `touched` before the request, since the broadcast may
+    # arrive before the response.
+    session = _session()
+    for i in range(ops):
+        board = rng.choice(boards)
+        if i % 2 == 0 or not ids[board]:
+            kind = 'POST /tasks'
+            started = time.perf_counter()
+            response = session.post(f'{url}/api/boards/{board}/tasks',
+                                    json={'title': f'{WRITER_TITLE}{i}', 'priority': rng.choice(PRIORITIES)})
+        else:
+            kind = 'PATCH /tasks/<id>'
+            task_id = rng.choice(ids[board])
+            touched.add(task_id)
+            started = time.perf_counter()
+            response = session.patch(f'{url}/api/boards/{board}/tasks/{task_id}',
+                                     json={'status': rng.choice(STATUSES)})
+        recorder.add(kind, time.perf_counter() - started)
+        if not response.ok:
+            recorder.error(kind)
+        elif kind == 'POST /tasks':
+            ids[board].append(response.json()['id'])
+
+
+def reader(url, boards, stop, rng, recorder):
+    session = _session()
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = session.get(f'{url}/api/boards/{rng.choice(boards)}/tasks',
+                               headers={'Accept-Encoding': 'gzip, br'})
+        recorder.add('GET /tasks', time.perf_counter() - started)
+        if not response.ok:
+            recorder.error('GET /tasks')
+
+
+def connect_clients(url, boards, count, touched, recorder):
+    # Only tasks the writers created (by title, since their ids are not
+    # known until the response) or updated are counted.
+    clients = []
+    for i in range(count):
+        client = socketio.Client(reconnection=False)
+
+        def on_delta(frame):
+            received = time.time()
+            for task in frame['tasks']:
+                if task['id'] in touched or task['title'].startswith(WRITER_TITLE):
+                    recorder.add('broadcast', received - datetime.fromisoformat(task['updated_at']).timestamp())
+
+        client.on('tasks_delta', on_delta)
+        client.connect(f'{url}?board={boards[i % len(boards)]}', transports=['websocket'])
+        clients.append(client)
+    return clients
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    boards = [f'bench-{i}' for i in range(args.boards)]
+    recorder = Recorder()
+    server = Server(args.workers) if not args.url else None
+    if server:
+        server.__enter__()
+    url = args.url or server.url
+    try:
+        seed_started = time.perf_counter()
+        ids = seed(url, boards, args.tasks, rng)
+        seed_seconds = time.perf_counter() - seed_started
+        wait_for_broadcasts(url)
+        touched = set()
+        clients = connect_clients(url, boards, args.clients, touched, recorder)
+        stop = threading.Event()
+        readers = [threading.Thread(target=reader, args=(url, boards, stop, random.Random(args.seed + 1000 + i), recorder))
+                   for i in range(args.readers)]
+        writers = [threading.Thread(target=writer, args=(url, boards, ids, touched, args.ops, random.Random(args.seed + i), recorder))
+                   for i in range(args.writers)]
+        started = time.perf_counter()
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        for thread in readers:
+            thread.join()
+        time.sleep(args.settle)
+        for client in clients:
+            client.disconnect()
+        session = _session()
+        server_stats = {name: session.get(f'{url}/api/{name}').json() for name in ('db/writer', 'broadcast')}
+    finally:
+        if server:
+            server.__exit__(None, None, None)
+    writes = sum(len(v) for k, v in recorder.latency.items() if k != 'broadcast' and not k.startswith('GET'))
+    return {
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        'seed_seconds': seed_seconds,
+        'elapsed_seconds': elapsed,
+        'throughput': {
+            'writes_per_second': writes / elapsed,
+            'reads_per_second': len(recorder.latency.get('GET /tasks', [])) / elapsed,
+            'broadcast_deliveries_per_second': len(recorder.latency.get('broadcast', [])) / elapsed,
+        },
+        'latency_seconds': {kind: percentiles(values) for kind, values in sorted(recorder.latency.items())},
+        'errors': recorder.errors,
+        'server': server_stats,
+    }
+
+
+def report(result):
+    print(f"commit {result['commit']}  elapsed {result['elapsed_seconds']:.2f}s  seed {result['seed_seconds']:.2f}s")
+    for name, value in result['throughput'].items():
+        print(f'  {name:34} {value:10.1f}')
+    print(f"  {'latency (ms)':22} {'count':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for kind, stats in result['latency_seconds'].items():
+        cells = ''.join(f' {stats[q] * 1000:8.2f}' if stats[q] is not None else f" {'-':>8}" for q in ('p50', 'p95', 'p99', 'max'))
+        print(f"  {kind:22} {stats['count']:8d}{cells}")
+    if result['errors']:
+        print(f"  errors: {result['errors']}")
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    change = lambda a, b: f'{(b - a) / a * 100:+7.1f}%' if a else '      -'
+    print(f"{old['commit']} -> {new['commit']}")
+    for name, value in new['throughput'].items():
+        before = old['throughput'].get(name)
+        print(f'  {name:34} {value:10.1f} {change(before, value) if before is not None else ""}')
+    for kind, stats in new['latency_seconds'].items():
+        before = old['latency_seconds'].get(kind, {})
+        for q in ('p50', 'p95', 'p99'):
+            if stats[q] is not None and before.get(q) is not None:
+                print(f'  {kind:22} {q} {stats[q] * 1000:8.2f}ms {change(before[q], stats[q])}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', help='benchmark a running server instead of booting one')
+    parser.add_argument('--workers', type=int, default=1, help='gunicorn workers for the booted server')
+    parser.add_argument('--boards', type=int, default=2)
+    parser.add_argument('--tasks', type=int, default=1000, help='seeded tasks per board')
+    parser.add_argument('--writers', type=int, default=8, help='concurrent REST writers')
+    parser.add_argument('--ops', type=int, default=200, help='requests per writer')
+    parser.add_argument('--readers', type=int, default=2, help='concurrent GET /tasks loops while writers run')
+    parser.add_argument('--clients', type=int, default=20, help='Socket.IO clients, spread over the boards')
+    parser.add_argument('--settle', type=float, default=1.0, help='seconds to wait for trailing broadcasts')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='JSON results path (default bench-results/<commit>-<time>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two saved results and exit')
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+    result = run(args)
+    report(result)
+    output = args.output or os.path.join('bench-results', f"{result['commit'] or 'local'}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f'saved {output}')
+
+
+if __name__ == '__main__':
+    main()
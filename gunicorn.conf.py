@@ -0,0 +1,41 @@
+# Launcher: gunicorn -c gunicorn.conf.py app:app
+#
+# KANBAN_WORKERS > 1 runs several eventlet workers sharing the SQLite board
+# and Socket.IO broadcasts. Unless SOCKETIO_MESSAGE_QUEUE points at an
+# external queue (e.g. redis://host:6379/0), the bundled local_mq broker is
+# started on a Unix socket next to this process.
+#
+# Sticky sessions: gunicorn hands connections to workers round-robin, so the
+# long-polling transport (several requests per session) would hit different
+# workers. In multi-worker mode the app restricts Socket.IO to the websocket
+# transport, where a session is a single connection and stickiness is not
+# needed. If you put several hosts behind a load balancer and need polling,
+# enable client affinity there (e.g. nginx ip_hash) and use a shared queue.
+import os
+import subprocess
+import sys
+
+workers = int(os.environ.get('KANBAN_WORKERS', 1))
+worker_class = 'eventlet'
+worker_connections = int(os.environ.get('KANBAN_WORKER_CONNECTIONS', 1000))
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+timeout = 120
+# Each worker must open its own SQLite connections after the fork.
+preload_app = False
+
+MQ_SOCKET = os.environ.get('KANBAN_MQ_SOCKET', '/tmp/kanban-mq.sock')
+if workers > 1:
+    os.environ.setdefault('SOCKETIO_MESSAGE_QUEUE', f'unix://{MQ_SOCKET}')
+
+_broker = None
+
+def on_starting(server):
+    global _broker
+    if os.environ.get('SOCKETIO_MESSAGE_QUEUE', '').startswith('unix://'):
+        path = os.environ['SOCKETIO_MESSAGE_QUEUE'][len('unix://'):]
+        _broker = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'local_mq.py'), path])
+        server.log.info('Started local message queue on %s (pid %s)', path, _broker.pid)
+
+def on_exit(server):
+    if _broker is not None:
+        _broker.terminate()
@@ -0,0 +1,129 @@
+"""Single-host Socket.IO message queue over a Unix socket.
+
+Lets several worker processes on one machine share broadcasts without an
+external Redis. The broker relays every frame it receives to all other
+connected workers; each worker plugs in through ``UnixSocketManager``.
+
+    python local_mq.py /tmp/kanban-mq.sock
+    SOCKETIO_MESSAGE_QUEUE=unix:///tmp/kanban-mq.sock gunicorn -c gunicorn.conf.py app:app
+"""
+import logging
+import os
+import pickle
+import struct
+import sys
+
+import eventlet
+from eventlet.green import socket
+from eventlet.semaphore import Semaphore
+import socketio
+
+HEADER = struct.Struct('!I')
+RECONNECT_DELAY = 0.5
+
+logger = logging.getLogger('local_mq')
+
+
+def _recv_exact(sock, size):
+    buf = b''
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError('connection closed')
+        buf += chunk
+    return buf
+
+
+def read_frame(sock):
+    (size,) = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    return _recv_exact(sock, size)
+
+
+def write_frame(sock, payload):
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def run_broker(path):
+    if os.path.exists(path):
+        os.unlink(path)
+    server = eventlet.listen(path, family=socket.AF_UNIX)
+    peers = set()
+
+    def relay(conn):
+        peers.add(conn)
+        try:
+            while True:
+                frame = read_frame(conn)
+                for peer in list(peers):
+                    if peer is conn:
+                        continue
+                    try:
+                        write_frame(peer, frame)
+                    except OSError:
+                        peers.discard(peer)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            peers.discard(conn)
+            conn.close()
+
+    logger.info('local message queue listening on %s', path)
+    while True:
+        conn, _ = server.accept()
+        eventlet.spawn(relay, conn)
+
+
+class UnixSocketManager(socketio.PubSubManager):
+    name = 'unix'
+
+    def __init__(self, url='unix:///tmp/kanban-mq.sock', channel='socketio', write_only=False, logger=None):
+        self.path = url[len('unix://'):]
+        self._sock = None
+        self._send_lock = Semaphore()
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.path)
+        return sock
+
+    def _publish(self, data):
+        payload = pickle.dumps({'channel': self.channel, 'data': data})
+        with self._send_lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._sock = self._connect()
+                    write_frame(self._sock, payload)
+                    return
+                except OSError:
+                    self._reset()
+            self._get_logger().error('local message queue at %s unavailable, message dropped', self.path)
+
+    def _reset(self):
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+
+    def _listen(self):
+        while True:
+            sock = None
+            try:
+                with self._send_lock:
+                    if self._sock is None:
+                        self._sock = self._connect()
+                    sock = self._sock
+                while True:
+                    message = pickle.loads(read_frame(sock))
+                    if message.get('channel') == self.channel:
+                        yield message['data']
+            except (ConnectionError, OSError):
+                with self._send_lock:
+                    if self._sock is sock:
+                        self._reset()
+                eventlet.sleep(RECONNECT_DELAY)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    run_broker(sys.argv[1] if len(sys.argv) > 1 else '/tmp/kanban-mq.sock')
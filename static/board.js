@@ -0,0 +1,176 @@
+// Board page. The server embeds the board snapshot in #boardState, so the
+// first paint needs no round-trip and the socket only delivers deltas.
+const STATE = JSON.parse(document.getElementById('boardState').textContent);
+const BOARD_ID = STATE.board_id;
+const socket = io({ transports: STATE.transports, query: { board: BOARD_ID } });
+const STATUSES = ['todo', 'doing', 'done'];
+const PAGE = 100;
+const tasks = new Map();
+const cards = new Map();
+const columns = {};
+let revision = 0;
+STATUSES.forEach(status => {
+    columns[status] = { ids: [], limit: PAGE, dirty: false, list: document.getElementById('tasks-' + status), more: document.getElementById('more-' + status), count: document.getElementById('count-' + status) };
+});
+socket.on('connect', () => {
+    document.getElementById('connectionStatus').classList.add('connected');
+    document.getElementById('connectionStatus').classList.remove('disconnected');
+    document.getElementById('connectionText').textContent = 'Live 🟢';
+    socket.emit('get_tasks', revision ? { since: revision } : {});
+});
+socket.on('disconnect', () => {
+    document.getElementById('connectionStatus').classList.remove('connected');
+    document.getElementById('connectionStatus').classList.add('disconnected');
+    document.getElementById('connectionText').textContent = 'Desconectado';
+});
+socket.on('tasks_update', (data) => { replaceTasks(data.tasks); revision = data.revision; });
+socket.on('tasks_delta', (delta) => {
+    const created = delta.tasks.filter(t => !tasks.has(t.id));
+    const removed = delta.deleted.filter(id => tasks.has(id)).length;
+    applyTasks(delta.tasks, delta.deleted);
+    revision = Math.max(revision, delta.revision);
+    if (created.length === 1) showToast('Task "' + created[0].title + '" criada!');
+    else if (created.length > 1) showToast(created.length + ' tasks criadas!');
+    else if (removed) showToast(removed === 1 ? 'Task removida' : removed + ' tasks removidas');
+});
+// Columns keep ids ordered like the server (created_at, id desc); only
+// the first `limit` cards of each column are in the DOM.
+function before(a, b) { return a.created_at !== b.created_at ? a.created_at > b.created_at : a.id > b.id; }
+function slot(ids, task) {
+    let lo = 0, hi = ids.length;
+    while (lo < hi) { const mid = (lo + hi) >> 1; if (before(tasks.get(ids[mid]), task)) lo = mid + 1; else hi = mid; }
+    return lo;
+}
+function unplace(task) {
+    const col = columns[task.status];
+    if (!col) return;
+    const i = slot(col.ids, task);
+    if (col.ids[i] === task.id) { col.ids.splice(i, 1); col.dirty = true; }
+}
+function place(task) {
+    const col = columns[task.status];
+    if (!col) return;
+    col.ids.splice(slot(col.ids, task), 0, task.id);
+    col.dirty = true;
+}
+function applyTasks(changed, deleted) {
+    changed.forEach(task => {
+        const prev = tasks.get(task.id);
+        if (prev && prev.revision > task.revision) return;
+        if (prev && (prev.status !== task.status || prev.created_at !== task.created_at)) unplace(prev);
+        tasks.set(task.id, task);
+        if (!prev || prev.status !== task.status || prev.created_at !== task.created_at) place(task);
+        else if (cards.has(task.id)) patchCard(cards.get(task.id), task);
+    });
+    deleted.forEach(id => {
+        const prev = tasks.get(id);
+        if (!prev) return;
+        unplace(prev);
+        tasks.delete(id);
+        const node = cards.get(id);
+        if (node) { node.remove(); cards.delete(id); }
+    });
+    flush();
+}
+function replaceTasks(list) {
+    const keep = new Set(list.map(t => t.id));
+    cards.forEach((node, id) => { if (!keep.has(id)) { node.remove(); cards.delete(id); } });
+    tasks.clear();
+    list.forEach(task => tasks.set(task.id, task));
+    STATUSES.forEach(status => {
+        const col = columns[status];
+        col.ids = list.filter(t => t.status === status).sort((a, b) => before(a, b) ? -1 : 1).map(t => t.id);
+        col.dirty = true;
+    });
+    flush();
+}
+function flush() {
+    STATUSES.forEach(status => { if (columns[status].dirty) syncColumn(columns[status]); });
+    document.getElementById('taskCount').textContent = tasks.size + ' tasks';
+}
+function syncColumn(col) {
+    col.dirty = false;
+    col.count.textContent = col.ids.length;
+    const visible = Math.min(col.limit, col.ids.length);
+    const wanted = new Set(col.ids.slice(0, visible));
+    Array.from(col.list.children).forEach(node => { if (!wanted.has(node.dataset.id)) node.remove(); });
+    let cursor = col.list.firstElementChild;
+    for (let i = 0; i < visible; i++) {
+        const node = cardFor(col.ids[i]);
+        if (node === cursor) cursor = cursor.nextElementSibling;
+        else col.list.insertBefore(node, cursor);
+    }
+    while (cursor) { const next = cursor.nextElementSibling; cursor.remove(); cursor = next; }
+    col.more.hidden = col.ids.length <= col.limit;
+    col.more.textContent = 'Mostrar mais (' + (col.ids.length - visible) + ')';
+}
+function cardFor(id) {
+    let node = cards.get(id);
+    if (!node) {
+        node = document.getElementById('cardTemplate').content.firstElementChild.cloneNode(true);
+        node.dataset.id = id;
+        cards.set(id, node);
+    }
+    const task = tasks.get(id);
+    if (node._task !== task) patchCard(node, task);
+    return node;
+}
+function patchCard(node, task) {
+    const prev = node._task || {};
+    node._task = task;
+    if (prev.priority !== task.priority) node.className = 'task priority-' + task.priority;
+    if (prev.title !== task.title) node.querySelector('.task-title').textContent = task.title;
+    if (prev.description !== task.description) {
+        const desc = node.querySelector('.task-desc');
+        desc.textContent = task.description || '';
+        desc.hidden = !task.description;
+    }
+    if (prev.source !== task.source) node.querySelector('.task-source').textContent = task.source === 'clawdbot' ? '🧠 Garion' : '🖥️ App';
+}
+function showMore(status) { const col = columns[status]; col.limit += PAGE; syncColumn(col); }
+const moreObserver = new IntersectionObserver(entries => entries.forEach(e => { if (e.isIntersecting && !e.target.hidden) showMore(e.target.id.slice(5)); }));
+STATUSES.forEach(status => {
+    const col = columns[status];
+    col.more.addEventListener('click', () => showMore(status));
+    moreObserver.observe(col.more);
+    col.list.addEventListener('dragstart', (e) => { const card = e.target.closest('.task'); if (!card) return; card.classList.add('dragging'); e.dataTransfer.setData('text/plain', card.dataset.id); });
+    col.list.addEventListener('dragend', (e) => { const card = e.target.closest('.task'); if (card) card.classList.remove('dragging'); STATUSES.forEach(s => columns[s].list.classList.remove('drop-zone')); });
+    col.list.addEventListener('dragover', (e) => { e.preventDefault(); col.list.classList.add('drop-zone'); });
+    col.list.addEventListener('dragleave', (e) => { if (!col.list.contains(e.relatedTarget)) col.list.classList.remove('drop-zone'); });
+    col.list.addEventListener('drop', (e) => {
+        e.preventDefault();
+        col.list.classList.remove('drop-zone');
+        const task = tasks.get(e.dataTransfer.getData('text/plain'));
+        if (task && task.status !== status) socket.emit('update_task', { id: task.id, status });
+    });
+    col.list.addEventListener('click', (e) => {
+        const button = e.target.closest('[data-action]');
+        if (!button) return;
+        const id = button.closest('.task').dataset.id;
+        if (button.dataset.action === 'edit') editTask(id); else deleteTask(id);
+    });
+});
+function openModal(status = 'todo') { document.getElementById('taskModal').classList.add('active'); document.getElementById('modalTitle').textContent = 'Nova Task'; document.getElementById('taskId').value = ''; document.getElementById('taskStatus').value = status; document.getElementById('taskTitle').value = ''; document.getElementById('taskDesc').value = ''; document.getElementById('taskPriority').value = 'medium'; document.getElementById('taskTitle').focus(); }
+function closeModal() { document.getElementById('taskModal').classList.remove('active'); }
+function editTask(id) { const task = tasks.get(id); if (!task) return; document.getElementById('taskModal').classList.add('active'); document.getElementById('modalTitle').textContent = 'Editar Task'; document.getElementById('taskId').value = task.id; document.getElementById('taskStatus').value = task.status; document.getElementById('taskTitle').value = task.title; document.getElementById('taskDesc').value = task.description || ''; document.getElementById('taskPriority').value = task.priority; }
+function deleteTask(id) { if (confirm('Remover esta task?')) { socket.emit('delete_task', { id }); } }
+document.getElementById('taskForm').addEventListener('submit', (e) => { e.preventDefault(); const id = document.getElementById('taskId').value; const data = { title: document.getElementById('taskTitle').value, description: document.getElementById('taskDesc').value, status: document.getElementById('taskStatus').value, priority: document.getElementById('taskPriority').value }; if (id) { socket.emit('update_task', { id, ...data }); } else { socket.emit('create_task', data); } closeModal(); });
+let searchTimer = null;
+function escapeHtml(text) { const div = document.createElement('div'); div.textContent = text; return div.innerHTML; }
+function highlight(text) { return escapeHtml(text).replace(/&lt;mark&gt;/g, '<mark>').replace(/&lt;\/mark&gt;/g, '</mark>'); }
+function runSearch() {
+    const q = document.getElementById('searchInput').value.trim();
+    const box = document.getElementById('searchResults');
+    if (!q) { box.classList.remove('active'); box.innerHTML = ''; return; }
+    socket.emit('search_tasks', { q }, (res) => {
+        if (document.getElementById('searchInput').value.trim() !== q) return;
+        box.innerHTML = res.results.length ? res.results.map(r => '<div class="search-result" data-id="' + escapeHtml(r.id) + '"><div class="task-title">' + highlight(r.title_highlight) + ' <span class="column-count">' + escapeHtml(r.status) + '</span></div>' + (r.description ? '<div class="task-desc">' + highlight(r.description_snippet) + '</div>' : '') + '</div>').join('') : '<div class="search-empty">Nenhuma task encontrada</div>';
+        box.classList.add('active');
+    });
+}
+document.getElementById('searchInput').addEventListener('input', () => { clearTimeout(searchTimer); searchTimer = setTimeout(runSearch, 200); });
+document.getElementById('searchResults').addEventListener('click', (e) => { const item = e.target.closest('.search-result'); if (!item) return; document.getElementById('searchResults').classList.remove('active'); editTask(item.dataset.id); });
+function showToast(message) { const toast = document.getElementById('toast'); toast.textContent = message; toast.classList.add('show'); setTimeout(() => toast.classList.remove('show'), 3000); }
+document.addEventListener('keydown', (e) => { if (e.key === 'Escape') { closeModal(); document.getElementById('searchResults').classList.remove('active'); } });
+replaceTasks(STATE.tasks);
+revision = STATE.revision;